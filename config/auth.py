@@ -1,4 +1,8 @@
+import hmac
+
+from django.conf import settings
 from ninja.security.http import HttpBearer
+
 from src.integrations.supabase import verify_supabase_token
 from src.utils.schemas import AuthSchema
 
@@ -12,6 +16,16 @@ class SupabaseJWTAuth(HttpBearer):
         return verify_supabase_token(token)
 
 
+class MetricsTokenAuth(HttpBearer):
+    def authenticate(self, request, token: str) -> bool | None:
+        """
+        Aceita só o token de METRICS_TOKEN (serviços internos, não usuários).
+        """
+        if not settings.METRICS_TOKEN or not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+            return None
+        return True
+
+
 def get_optional_user(request) -> AuthSchema | None:
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
@@ -1,16 +1,50 @@
-from django.core.cache import cache
+from datetime import timedelta
+
 from storages.backends.gcloud import GoogleCloudStorage
+from storages.utils import clean_name
+
+from config.storage import CachedUrlStorageMixin
 
 
-class GoogleCloudMediaFileStorage(GoogleCloudStorage):
+class GoogleCloudMediaFileStorage(CachedUrlStorageMixin, GoogleCloudStorage):
     def init(self, args, **kwargs):
         super().init(args, **kwargs)
 
-    def url(self, name, *args, **kwargs):
-        cache_key = f"signed_url_{name}"
-        signed_url = cache.get(cache_key)
-        if not signed_url:
-            signed_url = super().url(name, *args, **kwargs)
-            # Cache the signed URL with a timeout (e.g., 86400 seconds = 1 day)
-            cache.set(cache_key, signed_url, timeout=86400)
-        return signed_url
+    def signs_urls(self) -> bool:
+        # no modo CDN (querystring_auth=False) a URL é só o prefixo público + nome, sem custo
+        return self.querystring_auth and self.default_acl != "publicRead"
+
+    def sign_urls(self, names: list[str]) -> dict[str, str]:
+        """
+        Assina todos os nomes em uma passada, localmente, com a chave da service account já
+        carregada (sem chamada de rede por objeto).
+        """
+        return {name: self._sign(name, expiration=self.expiration) for name in names}
+
+    def generate_upload_url(
+        self, name: str, content_type: str, max_size: int, expiration: timedelta, session_id=None
+    ) -> dict:
+        """
+        URL assinada (v4) para o cliente enviar o arquivo direto para o bucket com um PUT.
+        O header `x-goog-content-length-range` faz o próprio GCS recusar arquivos acima de `max_size` e o
+        `x-goog-if-generation-match: 0` faz a URL só criar o objeto: depois do upload (e da validação na
+        ingestão) ele não pode mais ser substituído.
+        """
+        headers = {"x-goog-content-length-range": f"0,{max_size}", "x-goog-if-generation-match": "0"}
+        # assinada mesmo no modo CDN: o upload sempre vai para o bucket
+        url = self._sign(
+            name,
+            method="PUT",
+            expiration=expiration,
+            content_type=content_type,
+            headers=headers,
+        )
+        return {
+            "url": url,
+            "method": "PUT",
+            "headers": {"Content-Type": content_type, **headers},
+        }
+
+    def _sign(self, name: str, **params) -> str:
+        blob = self.bucket.blob(self._normalize_name(clean_name(name)))
+        return blob.generate_signed_url(version="v4", credentials=self.credentials, **params)
@@ -1,5 +1,7 @@
 import os
 import sys
+import tempfile
+from datetime import timedelta
 from pathlib import Path
 
 from django.utils.translation import gettext_lazy as _
@@ -97,6 +99,193 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media/")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Cache
+# Compartilhado entre os workers: Redis quando CACHE_URL (redis://...) está definido, senão a tabela no
+# Postgres (criada pela migration posts.0015). CACHE_BACKEND=file usa arquivos em CACHE_LOCATION (testes locais).
+# O acesso pela aplicação é feito com `src.utils.cache.NamespacedCache`.
+
+CACHE_URL = os.environ.get("CACHE_URL", "")
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "redis" if CACHE_URL else "database")
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "10000"))
+
+CACHE_BACKENDS = {
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_URL,
+        "OPTIONS": {
+            # falhas do Redis viram miss no NamespacedCache, então é melhor desistir rápido
+            "socket_connect_timeout": float(os.environ.get("CACHE_CONNECT_TIMEOUT", "0.5")),
+            "socket_timeout": float(os.environ.get("CACHE_SOCKET_TIMEOUT", "0.5")),
+        },
+    },
+    "database": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "cache_table",
+        "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "almanaque-cache")),
+        "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+    },
+}
+
+CACHES = {
+    "default": {
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        "TIMEOUT": 300,
+        "KEY_PREFIX": os.environ.get("CACHE_KEY_PREFIX", "almanaque"),
+    }
+}
+
+POSTSYNCER_CACHE_TTL = int(os.environ.get("POSTSYNCER_CACHE_TTL", "900"))
+
+# Auth cache
+# Tokens já validados ficam em memória (LRU por worker) até o `exp`, limitados a AUTH_TOKEN_CACHE_TTL;
+# o usuário de cada external_id fica no cache compartilhado, evitando o get_or_create a cada requisição.
+
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL = int(os.environ.get("AUTH_TOKEN_CACHE_TTL", "300"))
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", "3600"))
+
+# Search embeddings cache
+# Em memória (LRU por worker) + tabela `search_embeddings` compartilhada entre os workers
+
+SEARCH_EMBEDDING_CACHE_SIZE = int(os.environ.get("SEARCH_EMBEDDING_CACHE_SIZE", "1024"))
+SEARCH_EMBEDDING_CACHE_TTL = int(os.environ.get("SEARCH_EMBEDDING_CACHE_TTL", str(60 * 60 * 24 * 30)))
+SEARCH_EMBEDDING_CACHE_MAX_ROWS = int(os.environ.get("SEARCH_EMBEDDING_CACHE_MAX_ROWS", "100000"))
+
+# Hybrid search
+# Consultas com até SEARCH_KEYWORD_MAX_TERMS termos que casam no índice de texto não chamam o embedding.
+# As demais juntam os SEARCH_CANDIDATES melhores de cada ranking (texto e vetor) via reciprocal rank fusion.
+
+SEARCH_TEXT_CONFIG = os.environ.get("SEARCH_TEXT_CONFIG", "portuguese")
+SEARCH_KEYWORD_MAX_TERMS = int(os.environ.get("SEARCH_KEYWORD_MAX_TERMS", "2"))
+SEARCH_CANDIDATES = int(os.environ.get("SEARCH_CANDIDATES", "200"))
+SEARCH_RRF_K = int(os.environ.get("SEARCH_RRF_K", "60"))
+
+# Vector indexes
+# O tipo e os parâmetros dos índices ficam nos models (com migration); `rebuild_vector_indexes` só os recria.
+# Os perfis definem o recall/latência de cada endpoint (hnsw.ef_search e ivfflat.probes) e o
+# iterative scan, que mantém as páginas cheias quando os filtros descartam candidatos do índice.
+# `max_scan_tuples`/`max_probes` são o orçamento de candidatos de cada consulta. O ivfflat só tem
+# o modo relaxed_order, que pode devolver distâncias fora de ordem e quebrar o cursor da paginação.
+# No strict_order cada página reescaneia as linhas puladas pelas anteriores, então nos feeds paginados
+# o `max_scan_tuples` cresce `scan_tuples_per_row` por linha de profundidade do cursor, e o feed para
+# em `max_depth` linhas (o `next` volta vazio), mantendo o custo da página mais profunda limitado.
+
+VECTOR_SEARCH_PROFILES = {
+    "search": {
+        "ef_search": int(os.environ.get("VECTOR_SEARCH_EF_SEARCH", "40")),
+        "probes": int(os.environ.get("VECTOR_SEARCH_PROBES", "10")),
+        "iterative_scan": os.environ.get("VECTOR_SEARCH_ITERATIVE_SCAN", "strict_order"),
+        "max_scan_tuples": int(os.environ.get("VECTOR_SEARCH_MAX_SCAN_TUPLES", "20000")),
+        "ivfflat_iterative_scan": os.environ.get("VECTOR_SEARCH_IVFFLAT_ITERATIVE_SCAN", "off"),
+        "max_probes": int(os.environ.get("VECTOR_SEARCH_MAX_PROBES", "100")),
+    },
+    "recommended": {
+        "ef_search": int(os.environ.get("VECTOR_RECOMMENDED_EF_SEARCH", "100")),
+        "probes": int(os.environ.get("VECTOR_RECOMMENDED_PROBES", "20")),
+        "iterative_scan": os.environ.get("VECTOR_RECOMMENDED_ITERATIVE_SCAN", "strict_order"),
+        "max_scan_tuples": int(os.environ.get("VECTOR_RECOMMENDED_MAX_SCAN_TUPLES", "40000")),
+        "ivfflat_iterative_scan": os.environ.get("VECTOR_RECOMMENDED_IVFFLAT_ITERATIVE_SCAN", "off"),
+        "max_probes": int(os.environ.get("VECTOR_RECOMMENDED_MAX_PROBES", "200")),
+        "scan_tuples_per_row": int(os.environ.get("VECTOR_RECOMMENDED_SCAN_TUPLES_PER_ROW", "400")),
+        "max_depth": int(os.environ.get("VECTOR_RECOMMENDED_MAX_DEPTH", "1000")),
+    },
+}
+
+# User preferences
+# As reações são enfileiradas por usuário e aplicadas pelo worker `process_preference_updates`
+# depois de PREFERENCES_UPDATE_DELAY segundos, juntando as reações feitas nesse intervalo.
+# Uma fila que falha volta a ficar disponível só depois de PREFERENCES_RETRY_DELAY segundos.
+
+PREFERENCES_UPDATE_DELAY = int(os.environ.get("PREFERENCES_UPDATE_DELAY", "5"))
+PREFERENCES_RETRY_DELAY = int(os.environ.get("PREFERENCES_RETRY_DELAY", "60"))
+
+# Post ingestion
+# Os posts são criados como PENDING e processados pelo worker `process_ingestion_jobs`
+# (fetch -> media -> thumbnail -> vision -> embedding -> keywords).
+
+INGESTION_MAX_ATTEMPTS = int(os.environ.get("INGESTION_MAX_ATTEMPTS", "3"))
+INGESTION_RETRY_DELAY = int(os.environ.get("INGESTION_RETRY_DELAY", "30"))
+INGESTION_LEASE_TIMEOUT = int(os.environ.get("INGESTION_LEASE_TIMEOUT", "600"))
+
+# Outbound HTTP
+# Session compartilhada por processo (src/utils/http.py) com pool keep-alive por host.
+
+HTTP_POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "30"))
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "2"))
+
+# Metrics
+# `/metrics` expõe dados internos do processo e só responde com `Authorization: Bearer <METRICS_TOKEN>`;
+# sem METRICS_TOKEN definido o endpoint recusa todas as requisições.
+
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Media downloads
+# Download em streaming para um SpooledTemporaryFile, limitado por tamanho e content-type.
+
+MEDIA_MAX_DOWNLOAD_SIZE = int(os.environ.get("MEDIA_MAX_DOWNLOAD_SIZE", str(100 * 1024 * 1024)))
+MEDIA_MAX_THUMBNAIL_SIZE = int(os.environ.get("MEDIA_MAX_THUMBNAIL_SIZE", str(10 * 1024 * 1024)))
+MEDIA_SPOOL_MAX_MEMORY = int(os.environ.get("MEDIA_SPOOL_MAX_MEMORY", str(5 * 1024 * 1024)))
+MEDIA_DOWNLOAD_TIMEOUT = float(os.environ.get("MEDIA_DOWNLOAD_TIMEOUT", "30"))
+MEDIA_ALLOWED_CONTENT_TYPES = os.environ.get(
+    "MEDIA_ALLOWED_CONTENT_TYPES",
+    "image/jpeg,image/png,image/gif,image/webp,video/mp4,video/quicktime,video/webm",
+).split(",")
+
+# Perceptual hash
+# Posts com dHash a até PHASH_MAX_DISTANCE bits de diferença reaproveitam os metadados de IA.
+# Acima de 3 a busca por faixas (4 x 16 bits) deixa de encontrar todos os candidatos.
+
+PHASH_MAX_DISTANCE = int(os.environ.get("PHASH_MAX_DISTANCE", "3"))
+
+# Vision image
+# Versão reduzida (primeiro frame, lado maior limitado) enviada para Gemini/OpenAI, salva em `Posts.vision_image`.
+
+VISION_IMAGE_MAX_SIDE = int(os.environ.get("VISION_IMAGE_MAX_SIDE", "1024"))
+VISION_IMAGE_QUALITY = int(os.environ.get("VISION_IMAGE_QUALITY", "85"))
+VISION_IMAGE_FORMAT = os.environ.get("VISION_IMAGE_FORMAT", "JPEG").upper()
+
+# Video thumbnails
+# Processos do ffmpeg simultâneos por processo da aplicação e tempo máximo de cada extração.
+
+VIDEO_THUMBNAIL_MAX_PROCESSES = int(os.environ.get("VIDEO_THUMBNAIL_MAX_PROCESSES", "2"))
+VIDEO_THUMBNAIL_TIMEOUT = float(os.environ.get("VIDEO_THUMBNAIL_TIMEOUT", "20"))
+
+# Renditions
+# Versões em WebP por largura geradas na ingestão e expostas em `PostSchema.renditions`.
+
+RENDITION_WIDTHS = [int(width) for width in os.environ.get("RENDITION_WIDTHS", "320,640,1080").split(",")]
+RENDITION_QUALITY = int(os.environ.get("RENDITION_QUALITY", "80"))
+
+# Direct uploads
+# O cliente envia a mídia direto para o storage (URL assinada) e depois chama o finalize.
+
+UPLOAD_MAX_SIZE = int(os.environ.get("UPLOAD_MAX_SIZE", str(5 * 1024 * 1024)))
+UPLOAD_SESSION_EXPIRATION = int(os.environ.get("UPLOAD_SESSION_EXPIRATION", "900"))
+
+# Media URLs
+# URLs assinadas valem MEDIA_URL_EXPIRATION; o cache compartilhado guarda por menos tempo (e o memo do
+# processo menos ainda) para nunca entregar uma URL vencida. Com MEDIA_CDN_URL as URLs são públicas,
+# montadas direto no prefixo, sem assinatura.
+
+MEDIA_CDN_URL = os.environ.get("MEDIA_CDN_URL", "").rstrip("/")
+MEDIA_URL_EXPIRATION = int(os.environ.get("MEDIA_URL_EXPIRATION", "86400"))
+MEDIA_URL_CACHE_TTL = int(os.environ.get("MEDIA_URL_CACHE_TTL", str(MEDIA_URL_EXPIRATION * 3 // 4)))
+MEDIA_URL_MEMO_TTL = int(os.environ.get("MEDIA_URL_MEMO_TTL", "300"))
+MEDIA_URL_MEMO_SIZE = int(os.environ.get("MEDIA_URL_MEMO_SIZE", "10000"))
+
+# AI providers
+# Clientes criados uma vez por processo (src.integrations.registry); no boot do worker o warm-up pode
+# também abrir a conexão com cada provedor.
+
+AI_WARM_UP_CONNECT = os.environ.get("AI_WARM_UP_CONNECT", "True").lower() == "true"
+
 # Logging configuration
 LOGGING = {
     "version": 1,
@@ -135,7 +324,7 @@ GS_CREDENTIALS = service_account.Credentials.from_service_account_info(CREDENTIA
 
 STORAGES = {
     "default": {
-        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "BACKEND": "config.storage.LocalMediaFileStorage",
     },
     "staticfiles": {
         "BACKEND": "django,contrib.staticfiles.storage.StaticFilesStorage",
@@ -151,6 +340,10 @@ if ENVIRONMENT != "DEVELOPMENT":
                     "bucket_name": os.environ.get("BUCKET_NAME"),
                     "project_id": "wtm-international",
                     "credentials": GS_CREDENTIALS,
+                    "expiration": timedelta(seconds=MEDIA_URL_EXPIRATION),
+                    # com CDN o bucket (ou o CDN na frente dele) é público e as URLs não são assinadas
+                    "custom_endpoint": MEDIA_CDN_URL or None,
+                    "querystring_auth": not MEDIA_CDN_URL,
                 },
             },
         }
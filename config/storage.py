@@ -0,0 +1,126 @@
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import SuspiciousOperation
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+from src.utils.cache import NamespacedCache
+from src.utils.lru import LRUCache
+
+UPLOAD_SIGNING_SALT = "local-media-upload"
+
+# URLs já resolvidas neste processo, para que o FieldFile.url da serialização não vá ao cache
+_url_memo = LRUCache(max_size=settings.MEDIA_URL_MEMO_SIZE, ttl=settings.MEDIA_URL_MEMO_TTL)
+_url_cache = NamespacedCache("media_url", timeout=settings.MEDIA_URL_CACHE_TTL)
+
+
+class CachedUrlStorageMixin:
+    """
+    URLs assinadas resolvidas em lote: memo do processo, depois o cache compartilhado
+    (`get_many`/`set_many`) e só então assinatura, de todos os nomes que faltam de uma vez.
+
+    O cache guarda por MEDIA_URL_CACHE_TTL, menor que a validade da assinatura, para nunca
+    entregar uma URL vencida.
+    """
+
+    def url(self, name, *args, **kwargs):
+        # parâmetros customizados (método, headers, ...) geram URLs que não podem ser reaproveitadas
+        if args or kwargs or not name:
+            return super().url(name, *args, **kwargs)
+        return self.url_many([name])[name]
+
+    def url_many(self, names) -> dict[str, str]:
+        names = {name for name in names if name}
+        if not self.signs_urls():
+            return {name: super(CachedUrlStorageMixin, self).url(name) for name in names}
+
+        urls = {}
+        missing = []
+        for name in names:
+            url = _url_memo.get(name)
+            if url is None:
+                missing.append(name)
+            else:
+                urls[name] = url
+
+        if missing:
+            urls.update(_url_cache.get_many(missing))
+
+            unsigned = [name for name in missing if name not in urls]
+            if unsigned:
+                signed = self.sign_urls(unsigned)
+                _url_cache.set_many(signed)
+                urls.update(signed)
+
+            for name in missing:
+                _url_memo.set(name, urls[name])
+
+        return urls
+
+    def signs_urls(self) -> bool:
+        return True
+
+    def sign_urls(self, names: list[str]) -> dict[str, str]:
+        return {name: super(CachedUrlStorageMixin, self).url(name) for name in names}
+
+
+class LocalMediaFileStorage(FileSystemStorage):
+    """
+    FileSystemStorage com o mesmo fluxo de upload direto do GoogleCloudMediaFileStorage: a URL
+    assinada aponta para `PUT /api/v1/posts/uploads/local/{token}`, que grava o corpo da requisição.
+    """
+
+    def generate_upload_url(
+        self, name: str, content_type: str, max_size: int, expiration: timedelta, session_id=None
+    ) -> dict:
+        token = signing.dumps(
+            {
+                "name": name,
+                "content_type": content_type,
+                "max_size": max_size,
+                "session": str(session_id) if session_id else None,
+            },
+            salt=UPLOAD_SIGNING_SALT,
+        )
+        return {
+            "url": f"/api/v1/posts/uploads/local/{token}",
+            "method": "PUT",
+            "headers": {"Content-Type": content_type},
+        }
+
+    def url_many(self, names) -> dict[str, str]:
+        return {name: self.url(name) for name in names if name}
+
+    def load_upload_token(self, token: str) -> dict:
+        try:
+            return signing.loads(token, salt=UPLOAD_SIGNING_SALT, max_age=settings.UPLOAD_SESSION_EXPIRATION)
+        except signing.BadSignature:
+            raise SuspiciousOperation("Invalid or expired upload URL")
+
+    def receive_upload(self, token: str, stream, content_type: str, chunk_size: int = 64 * 1024) -> str:
+        """
+        Valida o token (assinatura, validade, content-type) e grava o corpo em streaming,
+        abortando assim que passar do tamanho máximo. Como no GCS, a URL só cria o arquivo:
+        um arquivo já enviado não é substituído.
+        """
+        data = self.load_upload_token(token)
+
+        if content_type != data["content_type"]:
+            raise SuspiciousOperation("Content type does not match the upload URL")
+
+        if self.exists(data["name"]):
+            raise SuspiciousOperation("File already uploaded")
+
+        with tempfile.SpooledTemporaryFile(max_size=chunk_size * 16) as tmp:
+            size = 0
+            while chunk := stream.read(chunk_size):
+                size += len(chunk)
+                if size > data["max_size"]:
+                    raise SuspiciousOperation("File size exceeds the upload limit")
+                tmp.write(chunk)
+
+            tmp.seek(0)
+            return self.save(data["name"], File(tmp))
@@ -6,7 +6,10 @@ from django.urls import path
 from ninja import NinjaAPI
 
 from config import settings
+from config.auth import MetricsTokenAuth
 from config.exceptions import set_default_exc_handlers
+from src.utils.cache import get_cache_stats
+from src.utils.http import get_http_stats
 
 api = NinjaAPI(
     title="Almanaque API",
@@ -53,6 +56,23 @@ def health_check(request):
     }
 
 
+@api.get(
+    "/metrics",
+    response={
+        200: Any,
+        500: Any,
+    },
+    auth=MetricsTokenAuth(),
+)
+def metrics(request):
+    # estatísticas do processo que atendeu a requisição
+    return 200, {
+        "pid": os.getpid(),
+        "http": get_http_stats(),
+        "cache": get_cache_stats(),
+    }
+
+
 set_default_exc_handlers(api)
 urlpatterns = [path("", api.urls)]
 
@@ -0,0 +1,10 @@
+# Configuração carregada automaticamente pelo gunicorn (./gunicorn.conf.py); as flags do CMD do
+# Dockerfile continuam valendo.
+
+
+def post_worker_init(worker):
+    # roda em cada worker depois do fork e do carregamento do Django: cria os clientes de IA do
+    # processo antes da primeira requisição
+    from src.integrations.registry import warm_up
+
+    warm_up()
@@ -1,41 +1,54 @@
 import uuid
+from datetime import timedelta
 from typing import cast
 
-import requests
 from config.auth import SupabaseJWTAuth, get_optional_user
-from django.core.files.base import ContentFile
+from django.conf import settings
+from django.core.exceptions import SuspiciousOperation
+from django.core.files.storage import default_storage
 from django.db import transaction
 from django.db.models import OuterRef, Subquery
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from ninja import File, Query, Router, UploadedFile
 from ninja.errors import HttpError
-from ninja.pagination import LimitOffsetPagination, paginate
+from ninja.pagination import paginate
 from pgvector.django import CosineDistance
 
-from src.apps.posts.enums import PostStatus, PostTypes
+from src.apps.posts.enums import IngestionStages, PostStatus, PostTypes, UploadStatus
 from src.apps.posts.filters import PostFilterSchema
-from src.apps.posts.models import Favorites, Keywords, Owners, Posts, Reactions
+from src.apps.posts.ingestion import enqueue_ingestion, find_duplicate_post
+from src.apps.posts.models import Favorites, IngestionJobs, Keywords, Owners, Posts, Reactions, UploadSessions
 from src.apps.posts.schemas import (
     PostFormSchema,
+    PostIngestionSchema,
     PostMediaFormSchema,
     PostReportFormSchema,
     PostReportSchema,
     PostSchema,
     PostUpdateFormSchema,
+    ReactionBatchItemSchema,
     ReactionFormSchema,
     ResponseSchema,
+    UploadSessionFormSchema,
+    UploadSessionSchema,
 )
+from src.apps.posts.services import set_reactions
 from src.apps.reports.enums import ReportStatus
 from src.apps.users.models import Users
-from src.integrations.almanaque_ai import AlmanaqueAI
 from src.integrations.postsyncer import Postsyncer
 from src.integrations.postsyncer.schemas import PostsyncerSchema
+from src.integrations.registry import get_almanaque_ai
 from src.utils.func_retry import retry
-from src.utils.movie import generate_video_thumbnail_from_upload
+from src.utils.pagination import KeysetPagination
 from src.utils.schemas import AuthenticatedRequest
+from src.utils.upload_file import UPLOAD_CONTENT_TYPES, file_sha256, path_and_rename_media
+from src.utils.url import normalize_social_url
 
 router = Router(tags=["Posts"])
 
+MAX_REACTIONS_BATCH = 500
+
 
 @router.get(
     "",
@@ -44,15 +57,14 @@ router = Router(tags=["Posts"])
         500: None,
     },
 )
-@paginate(LimitOffsetPagination)
+@paginate(KeysetPagination)
 def all(request: AuthenticatedRequest, filters: PostFilterSchema = Query(...)):
     auth = get_optional_user(request)
 
     queryset = (
-        Posts.objects.exclude(reports__status=ReportStatus.APPROVED)
-        .select_related("owner", "user")
-        .prefetch_related("keywords", "reactions")
-        .distinct()
+        Posts.objects.filter(is_hidden=False)
+        .select_related("owner", "user", "reaction_counters")
+        .prefetch_related("keywords")
     )
 
     if auth:
@@ -77,15 +89,15 @@ def all(request: AuthenticatedRequest, filters: PostFilterSchema = Query(...)):
     },
     auth=SupabaseJWTAuth(),
 )
-@paginate(LimitOffsetPagination)
+@paginate(KeysetPagination, vector_profile="recommended")
 def recommended(request: AuthenticatedRequest):
     user = Users.objects.get(uuid=request.auth.user.uuid)
     queryset = (
-        Posts.objects.exclude(reports__status=ReportStatus.APPROVED)
+        Posts.objects.filter(is_hidden=False)
         .exclude(embedding=None)
         .exclude(reactions__user_id=user.uuid)
-        .select_related("owner", "user")
-        .prefetch_related("keywords", "reactions")
+        .select_related("owner", "user", "reaction_counters")
+        .prefetch_related("keywords")
         .annotate(distance=CosineDistance("embedding", user.preferences_embedding))
         .order_by("distance")
     )
@@ -95,78 +107,29 @@ def recommended(request: AuthenticatedRequest):
 @router.post(
     "",
     response={
-        201: PostSchema,
+        200: PostSchema,
+        202: PostSchema,
         500: None,
     },
     auth=SupabaseJWTAuth(),
 )
 def create(request: AuthenticatedRequest, payload: PostFormSchema):
-    with transaction.atomic():
-        postsyncer = Postsyncer()
-        social_media_data = retry(postsyncer.get_social_media, payload.url)
-
-        owner = None
-        social_media_owner = social_media_data.get("owner")
-        if social_media_owner:
-            owner, _ = Owners.objects.get_or_create(
-                username=social_media_owner.get("username"),
-                defaults={
-                    "name": social_media_owner.get("full_name", social_media_data.get("author")),
-                    "is_verified": social_media_owner.get("is_verified"),
-                },
-            )
-
-        media = None
-        thumbnail = None
-        _type = None
-        medias = social_media_data.get("medias")
-
-        if picture := medias.get("images", []):
-            _type = PostTypes.IMAGE.value
-            _picture = requests.get(picture[0].get("url"))
-            media = ContentFile(_picture.content, name=f"{picture[0].get('id')}.{picture[0].get('extension')}")
-
-        if movie := medias.get("videos", []):
-            _type = PostTypes.VIDEO.value
-            _movie = requests.get(movie[0].get("url"))
-            media = ContentFile(_movie.content, name=f"{movie[0].get('id')}.{movie[0].get('extension')}")
-            if social_media_data.get("thumbnail", None):
-                _thumbnail = requests.get(social_media_data.get("thumbnail"))
-                thumbnail = ContentFile(_thumbnail.content, name="thumbnail.png")
-            else:
-                thumbnail: ContentFile = generate_video_thumbnail_from_upload(media)
+    normalized_link = normalize_social_url(payload.url)
+    if existing := find_duplicate_post(normalized_link=normalized_link):
+        return 200, existing
 
+    # o download, a IA e o embedding rodam no worker `process_ingestion_jobs`
+    with transaction.atomic():
         instance = Posts.objects.create(
-            media=media,
-            thumbnail=thumbnail,
-            type=_type,
-            status=PostStatus.APPROVED.value,
-            owner=owner,
+            status=PostStatus.PENDING.value,
+            is_hidden=True,
             user_id=request.auth.user.uuid,
-            provider=social_media_data.get("source"),
-            external_link=social_media_data.get("url"),
+            external_link=payload.url,
+            normalized_link=normalized_link,
         )
+        enqueue_ingestion(instance, IngestionStages.FETCH, {"url": payload.url})
 
-        almanaque_ai = AlmanaqueAI()
-
-        try:
-            data = almanaque_ai.process_image(instance.media_to_base64())
-
-            keywords = []
-            for keyword in data.get("keywords", []):
-                _keyword, _ = Keywords.objects.get_or_create(name=keyword.upper())
-                keywords.append(_keyword)
-
-            instance.title = data.get("title")
-            instance.description = data.get("description")
-            instance.embedding = almanaque_ai.get_embedding(instance.description)
-            instance.keywords.set(keywords)
-        except Exception:
-            raise HttpError(400, "The file could not be processed")
-
-        instance.save()
-
-        return 201, instance
+    return 202, instance
 
 
 @router.put(
@@ -182,7 +145,7 @@ def update(request: AuthenticatedRequest, uuid: uuid.UUID, payload: PostUpdateFo
     instance.title = payload.title
     instance.description = payload.description
 
-    almanaque_ai = AlmanaqueAI()
+    almanaque_ai = get_almanaque_ai()
 
     try:
         instance.embedding = almanaque_ai.get_embedding(instance.description)
@@ -201,7 +164,8 @@ def update(request: AuthenticatedRequest, uuid: uuid.UUID, payload: PostUpdateFo
 @router.post(
     "/media",
     response={
-        201: PostSchema,
+        200: PostSchema,
+        202: PostSchema,
         500: None,
     },
     auth=SupabaseJWTAuth(),
@@ -217,39 +181,138 @@ def create_media(request: AuthenticatedRequest, media: UploadedFile = File(...))
     if cast(int, media.size) > max_size:
         raise HttpError(400, "File size exceeds limit 5MB")
 
+    media_hash = file_sha256(media)
+    if existing := find_duplicate_post(media_hash=media_hash):
+        return 200, existing
+
     with transaction.atomic():
         instance = Posts.objects.create(
             media=media,
-            type=PostTypes.IMAGE.value,
-            status=PostStatus.APPROVED.value,
+            media_hash=media_hash,
+            type=PostTypes.VIDEO.value if extension == "mp4" else PostTypes.IMAGE.value,
+            status=PostStatus.PENDING.value,
+            is_hidden=True,
             user_id=request.auth.user.uuid,
         )
+        enqueue_ingestion(instance, IngestionStages.THUMBNAIL)
+
+    return 202, instance
+
+
+@router.post(
+    "/uploads",
+    response={
+        201: UploadSessionSchema,
+        500: None,
+    },
+    auth=SupabaseJWTAuth(),
+)
+def create_upload(request: AuthenticatedRequest, payload: UploadSessionFormSchema):
+    """
+    Abre uma sessão de upload direto: o cliente envia a mídia para `upload_url` (sem passar pela API)
+    e depois chama `/uploads/{uuid}/finalize`.
+    """
+    extension = UPLOAD_CONTENT_TYPES.get(payload.content_type)
+    if not extension:
+        raise HttpError(400, "Invalid media type, possible types jpg, jpeg, png, gif, mp4")
+
+    if payload.size > settings.UPLOAD_MAX_SIZE:
+        raise HttpError(400, f"File size exceeds limit {settings.UPLOAD_MAX_SIZE // (1024 * 1024)}MB")
+
+    expiration = timedelta(seconds=settings.UPLOAD_SESSION_EXPIRATION)
+    session = UploadSessions(
+        post_uuid=uuid.uuid4(),
+        user_id=request.auth.user.uuid,
+        content_type=payload.content_type,
+        max_size=payload.size,
+        expires_at=timezone.now() + expiration,
+    )
+    session.name = path_and_rename_media(Posts(uuid=session.post_uuid), f"media.{extension}")
+
+    upload = default_storage.generate_upload_url(
+        session.name, session.content_type, session.max_size, expiration, session_id=session.uuid
+    )
+    session.save()
+
+    return 201, UploadSessionSchema(
+        uuid=session.uuid,
+        upload_url=request.build_absolute_uri(upload["url"]),
+        method=upload["method"],
+        headers=upload["headers"],
+        expires_at=session.expires_at,
+    )
+
+
+@router.put(
+    "/uploads/local/{token}",
+    response={
+        204: None,
+        500: None,
+    },
+    auth=None,
+)
+def local_upload(request: AuthenticatedRequest, token: str):
+    # só existe com o LocalMediaFileStorage, no GCS o upload vai direto para o bucket
+    if not hasattr(default_storage, "receive_upload"):
+        raise HttpError(404, "Not found")
+
+    try:
+        data = default_storage.load_upload_token(token)
+        # depois do finalize o arquivo é validado pela ingestão e não pode mais ser trocado
+        if not UploadSessions.objects.filter(uuid=data.get("session"), status=UploadStatus.PENDING).exists():
+            raise HttpError(409, "Upload session already finalized")
+
+        default_storage.receive_upload(token, request, request.content_type)
+    except SuspiciousOperation as e:
+        raise HttpError(400, str(e))
 
-        if extension == "mp4":
-            thumbnail: ContentFile = generate_video_thumbnail_from_upload(media)
-            instance.thumbnail = thumbnail
-            instance.type = PostTypes.VIDEO.value
-            instance.save()
+    return 204, None
 
-        almanaque_ai = AlmanaqueAI()
 
-        try:
-            data = almanaque_ai.process_image(instance.media_to_base64())
+@router.post(
+    "/uploads/{uuid:uuid}/finalize",
+    response={
+        200: PostSchema,
+        202: PostSchema,
+        500: None,
+    },
+    auth=SupabaseJWTAuth(),
+)
+def finalize_upload(request: AuthenticatedRequest, uuid: uuid.UUID):
+    session = get_object_or_404(UploadSessions, uuid=uuid, user_id=request.auth.user.uuid)
+    if session.status == UploadStatus.COMPLETED:
+        return 200, get_object_or_404(Posts, uuid=session.post_uuid)
 
-            keywords = []
-            for keyword in data.get("keywords", []):
-                _keyword, _ = Keywords.objects.get_or_create(name=keyword.upper())
-                keywords.append(_keyword)
+    if session.expires_at < timezone.now():
+        raise HttpError(410, "Upload session expired")
+
+    # só metadados aqui: o conteúdo é lido e validado pelo worker de ingestão
+    if not default_storage.exists(session.name):
+        raise HttpError(400, "File not uploaded")
+
+    if default_storage.size(session.name) > session.max_size:
+        default_storage.delete(session.name)
+        raise HttpError(400, "File size exceeds the declared size")
+
+    with transaction.atomic():
+        session = UploadSessions.objects.select_for_update().get(uuid=session.uuid)
+        if session.status == UploadStatus.COMPLETED:
+            return 200, Posts.objects.get(uuid=session.post_uuid)
+
+        instance = Posts.objects.create(
+            uuid=session.post_uuid,
+            media=session.name,
+            type=PostTypes.VIDEO.value if session.content_type.startswith("video/") else PostTypes.IMAGE.value,
+            status=PostStatus.PENDING.value,
+            is_hidden=True,
+            user_id=request.auth.user.uuid,
+        )
+        enqueue_ingestion(instance, IngestionStages.STORE_MEDIA, {"content_type": session.content_type})
 
-            instance.title = data.get("title")
-            instance.description = data.get("description")
-            instance.embedding = almanaque_ai.get_embedding(instance.description)
-            instance.keywords.set(keywords)
-            instance.save()
-        except Exception:
-            raise HttpError(400, "The file could not be processed")
+        session.status = UploadStatus.COMPLETED
+        session.save(update_fields=["status", "updated_at"])
 
-        return 201, instance
+    return 202, instance
 
 
 @router.post(
@@ -272,12 +335,17 @@ def get_social_media(request: AuthenticatedRequest, payload: PostFormSchema):
 @router.post(
     "/data",
     response={
-        201: PostSchema,
+        200: PostSchema,
+        202: PostSchema,
         500: None,
     },
     auth=SupabaseJWTAuth(),
 )
 def create_media_data(request: AuthenticatedRequest, payload: PostMediaFormSchema):
+    normalized_link = normalize_social_url(payload.url)
+    if existing := find_duplicate_post(normalized_link=normalized_link):
+        return 200, existing
+
     with transaction.atomic():
         owner = None
 
@@ -290,54 +358,51 @@ def create_media_data(request: AuthenticatedRequest, payload: PostMediaFormSchem
                 },
             )
 
-        media = None
-        thumbnail = None
-
-        if payload.media.type == "images":
-            _type = PostTypes.IMAGE.value
-            _picture = requests.get(payload.media.url)
-            media = ContentFile(_picture.content, name=f"{payload.media.id}.{payload.media.extension}")
-
-        if payload.media.type == "videos":
-            _type = PostTypes.VIDEO.value
-            _movie = requests.get(payload.media.url)
-            media = ContentFile(_movie.content, name=f"{payload.media.id}.{payload.media.extension}")
-            if payload.media.thumbnail:
-                _thumbnail = requests.get(payload.media.thumbnail)
-                thumbnail = ContentFile(_thumbnail.content, name="thumbnail.png")
-            else:
-                thumbnail: ContentFile = generate_video_thumbnail_from_upload(media)
-
         instance = Posts.objects.create(
-            media=media,
-            thumbnail=thumbnail,
-            type=_type,
-            status=PostStatus.APPROVED.value,
+            status=PostStatus.PENDING.value,
+            is_hidden=True,
             owner=owner,
             user_id=request.auth.user.uuid,
-            provider=media.source,
-            external_link=media.url,
+            provider=payload.source,
+            external_link=payload.url,
+            normalized_link=normalized_link,
+        )
+        enqueue_ingestion(
+            instance,
+            IngestionStages.STORE_MEDIA,
+            {
+                "media": {
+                    "url": payload.media.url,
+                    "name": f"{payload.media.id}.{payload.media.extension}",
+                    "type": PostTypes.VIDEO.value if payload.media.type == "videos" else PostTypes.IMAGE.value,
+                    "thumbnail": payload.thumbnail,
+                },
+            },
         )
 
-        almanaque_ai = AlmanaqueAI()
+    return 202, instance
 
-        try:
-            data = almanaque_ai.process_image(instance.media_to_base64())
 
-            keywords = []
-            for keyword in data.get("keywords", []):
-                _keyword, _ = Keywords.objects.get_or_create(name=keyword.upper())
-                keywords.append(_keyword)
+@router.get(
+    "/{uuid:uuid}/status",
+    response={
+        200: PostIngestionSchema,
+        500: None,
+    },
+    auth=SupabaseJWTAuth(),
+)
+def ingestion_status(request: AuthenticatedRequest, uuid: uuid.UUID):
+    post = Posts.all_objects.filter(uuid=uuid, user_id=request.auth.user.uuid).values("uuid", "status").first()
+    if not post:
+        raise HttpError(404, "Post not found")
 
-            instance.title = data.get("title")
-            instance.description = data.get("description")
-            instance.embedding = almanaque_ai.get_embedding(instance.description)
-            instance.keywords.set(keywords)
-            instance.save()
-        except Exception:
-            raise HttpError(400, "The file could not be processed")
+    job = (
+        IngestionJobs.objects.filter(post_id=uuid).values("stage", "status", "attempts", "error", "updated_at").first()
+    )
+    if job:
+        post.update(job, job_status=job.pop("status"))
 
-        return 201, instance
+    return 200, post
 
 
 @router.delete(
@@ -391,27 +456,31 @@ def create_report(request: AuthenticatedRequest, uuid: uuid.UUID, payload: PostR
     auth=SupabaseJWTAuth(),
 )
 def create_reaction(request: AuthenticatedRequest, uuid: uuid.UUID, payload: ReactionFormSchema):
-    post = Posts.objects.get(uuid=uuid)
-    if not post:
+    changes = set_reactions(request.auth.user.uuid, [(uuid, payload.type)])
+    if not changes:
         raise HttpError(404, "Post not found")
 
-    instance, created = Reactions.objects.get_or_create(
-        post=post,
-        user_id=request.auth.user.uuid,
-        defaults={
-            "type": payload.type,
-        },
+    return 200, ResponseSchema(
+        detail="Reaction updated",
     )
 
-    if not created:
-        if not payload.type:
-            instance.delete()
-        else:
-            instance.type = payload.type
-            instance.save(update_fields=["type"])
+
+@router.post(
+    "/reactions",
+    response={
+        200: ResponseSchema,
+        500: None,
+    },
+    auth=SupabaseJWTAuth(),
+)
+def create_reactions(request: AuthenticatedRequest, payload: list[ReactionBatchItemSchema]):
+    if len(payload) > MAX_REACTIONS_BATCH:
+        raise HttpError(400, f"A batch accepts at most {MAX_REACTIONS_BATCH} reactions")
+
+    set_reactions(request.auth.user.uuid, [(item.post_uuid, item.type) for item in payload])
 
     return 200, ResponseSchema(
-        detail="Reaction updated",
+        detail="Reactions updated",
     )
 
 
@@ -452,12 +521,12 @@ def create_favorite(request: AuthenticatedRequest, uuid: uuid.UUID):
     },
     auth=SupabaseJWTAuth(),
 )
-@paginate(LimitOffsetPagination)
+@paginate(KeysetPagination)
 def favorites(request: AuthenticatedRequest, filters: PostFilterSchema = Query(...)):
     queryset = (
-        Posts.objects.exclude(reports__status=ReportStatus.APPROVED)
+        Posts.objects.filter(is_hidden=False)
         .filter(favorites__user_id=request.auth.user.uuid)
-        .select_related("owner", "user")
-        .prefetch_related("keywords", "reactions")
+        .select_related("owner", "user", "reaction_counters")
+        .prefetch_related("keywords")
     )
     return filters.filter(queryset)
@@ -32,6 +32,18 @@ class ReactionTypes(StrEnum):
 REACTION_TYPES = tuple((e.value, e.name) for e in ReactionTypes)
 
 
+REACTION_COUNTERS = {
+    "LIKE": "likes",
+    "DISLIKE": "dislikes",
+    "LOVE": "loves",
+    "LAUGH": "laughs",
+    "WOW": "wow",
+    "SAD": "sad",
+    "ANGRY": "angry",
+    "INSIGHTFUL": "insightful",
+}
+
+
 REACTION_WEIGHTS = {
     "LIKE": 1.0,
     "DISLIKE": -1.0,
@@ -42,3 +54,36 @@ REACTION_WEIGHTS = {
     "ANGRY": -1.0,
     "INSIGHTFUL": 1.0,
 }
+
+
+class IngestionStages(StrEnum):
+    FETCH = "FETCH"
+    STORE_MEDIA = "STORE_MEDIA"
+    THUMBNAIL = "THUMBNAIL"
+    RENDITIONS = "RENDITIONS"
+    PHASH = "PHASH"
+    VISION = "VISION"
+    EMBEDDING = "EMBEDDING"
+    KEYWORDS = "KEYWORDS"
+    DONE = "DONE"
+
+
+INGESTION_STAGES = tuple((e.value, e.name) for e in IngestionStages)
+
+
+class IngestionStatus(StrEnum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+INGESTION_STATUS = tuple((e.value, e.name) for e in IngestionStatus)
+
+
+class UploadStatus(StrEnum):
+    PENDING = "PENDING"
+    COMPLETED = "COMPLETED"
+
+
+UPLOAD_STATUS = tuple((e.value, e.name) for e in UploadStatus)
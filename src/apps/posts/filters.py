@@ -2,9 +2,8 @@ from datetime import datetime
 
 from django.db.models import Q, QuerySet
 from ninja import Field, FilterSchema
-from pgvector.django import CosineDistance
 
-from src.integrations.openai import OpenAI
+from src.apps.posts.services import search_posts
 
 
 class PostFilterSchema(FilterSchema):
@@ -21,12 +20,9 @@ class PostFilterSchema(FilterSchema):
         # aplica os filtros normais (search, status, types, datas, etc.)
         queryset = super().filter(queryset)
 
-        # se vier um embedding, faz o annotate da distância aqui
+        # busca híbrida (texto + embedding), ordenada pela relevância
         if self.search:
-            openai = OpenAI()
-            search_embeddings = openai.get_embedding(self.search)
-            queryset = queryset.annotate(distance=CosineDistance("embedding", search_embeddings))
-            queryset = queryset.order_by("distance")
+            queryset = search_posts(queryset, self.search)
 
         return queryset
 
@@ -0,0 +1,345 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import IntegerField, Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from src.apps.posts.enums import IngestionStages, IngestionStatus, PostStatus, PostTypes
+from src.apps.posts.models import IngestionJobs, Keywords, Owners, Posts
+from src.apps.posts.services import get_vision_metadata
+from src.apps.reports.services import sync_post_visibility
+from src.integrations.postsyncer import Postsyncer
+from src.integrations.registry import get_almanaque_ai
+from src.utils.download import download_file
+from src.utils.func_retry import retry
+from src.utils.image import dhash, hash_bands
+from src.utils.upload_file import detect_content_type, file_sha256
+from src.utils.url import normalize_social_url
+from src.utils.movie import generate_video_thumbnail_from_upload
+
+logger = logging.getLogger(__name__)
+
+STAGES = [
+    IngestionStages.FETCH,
+    IngestionStages.STORE_MEDIA,
+    IngestionStages.THUMBNAIL,
+    IngestionStages.RENDITIONS,
+    IngestionStages.PHASH,
+    IngestionStages.VISION,
+    IngestionStages.EMBEDDING,
+    IngestionStages.KEYWORDS,
+]
+
+
+def enqueue_ingestion(post: Posts, stage: IngestionStages = IngestionStages.FETCH, payload: dict | None = None):
+    """
+    Cria o job de ingestão do post a partir da etapa informada. Deve ser chamado na mesma
+    transação que cria o post, assim o worker nunca vê um job sem post.
+    """
+    return IngestionJobs.objects.create(post=post, stage=stage, payload=payload or {})
+
+
+def find_duplicate_post(exclude: Posts | None = None, **lookup) -> Posts | None:
+    """
+    Post já existente (e não rejeitado) com o mesmo `normalized_link` ou `media_hash`. Posts aprovados
+    que foram ocultados pela moderação não contam; os em processamento (também ocultos) sim.
+    """
+    queryset = (
+        Posts.objects.filter(**lookup)
+        .exclude(status=PostStatus.REJECTED)
+        .exclude(status=PostStatus.APPROVED, is_hidden=True)
+    )
+    if exclude is not None:
+        queryset = queryset.exclude(uuid=exclude.uuid)
+    return queryset.order_by("created_at").first()
+
+
+def find_similar_post(phash: int, exclude: Posts | None = None) -> Posts | None:
+    """
+    Post aprovado e visível visualmente quase idêntico: busca candidatos com alguma faixa do hash em
+    comum (índice GIN) e filtra pela distância de Hamming <= `PHASH_MAX_DISTANCE`.
+    """
+    queryset = (
+        Posts.objects.filter(phash_bands__overlap=hash_bands(phash), status=PostStatus.APPROVED, is_hidden=False)
+        .annotate(
+            phash_distance=RawSQL('bit_count(("posts"."phash" # %s)::bit(64))', (phash,), output_field=IntegerField())
+        )
+        .filter(phash_distance__lte=settings.PHASH_MAX_DISTANCE)
+    )
+    if exclude is not None:
+        queryset = queryset.exclude(uuid=exclude.uuid)
+    return queryset.order_by("phash_distance", "created_at").first()
+
+
+def claim_jobs(batch_size: int) -> list[IngestionJobs]:
+    """
+    Reserva jobs disponíveis para este worker. Jobs RUNNING com lease vencido (worker que morreu)
+    voltam a ficar disponíveis.
+    """
+    now = timezone.now()
+    expired = now - timedelta(seconds=settings.INGESTION_LEASE_TIMEOUT)
+
+    with transaction.atomic():
+        # SKIP LOCKED permite rodar vários workers sem pegar o mesmo job
+        jobs = list(
+            IngestionJobs.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=IngestionStatus.PENDING, available_at__lte=now)
+                | Q(status=IngestionStatus.RUNNING, locked_at__lt=expired)
+            )
+            .order_by("available_at")[:batch_size]
+        )
+
+        for job in jobs:
+            job.status = IngestionStatus.RUNNING
+            job.locked_at = now
+            job.attempts += 1
+            job.updated_at = now
+
+        IngestionJobs.objects.bulk_update(jobs, ["status", "locked_at", "attempts", "updated_at"])
+
+    return jobs
+
+
+def process_job(job: IngestionJobs):
+    """
+    Executa as etapas restantes do job. Cada etapa é salva ao terminar, então uma nova
+    tentativa continua de onde parou em vez de refazer o download ou a chamada de IA.
+    """
+    post = Posts.all_objects.get(uuid=job.post_id)
+
+    try:
+        while job.stage != IngestionStages.DONE:
+            # uma etapa pode pular as seguintes (ex.: quando reaproveita um post duplicado)
+            next_stage = STAGE_HANDLERS[job.stage](job, post)
+            job.stage = next_stage or _next_stage(job.stage)
+            job.save(update_fields=["stage", "payload", "updated_at"])
+    except Exception as e:
+        logger.exception("Ingestion of post %s failed at %s", post.uuid, job.stage)
+        _fail(job, post, e)
+        return
+
+    job.status = IngestionStatus.COMPLETED
+    job.error = None
+    job.locked_at = None
+    job.save(update_fields=["status", "error", "locked_at", "updated_at"])
+
+
+def _fail(job: IngestionJobs, post: Posts, error: Exception):
+    job.error = str(error)
+    job.locked_at = None
+
+    if job.attempts < settings.INGESTION_MAX_ATTEMPTS:
+        job.status = IngestionStatus.PENDING
+        job.available_at = timezone.now() + timedelta(seconds=settings.INGESTION_RETRY_DELAY * job.attempts)
+    else:
+        job.status = IngestionStatus.FAILED
+        Posts.all_objects.filter(uuid=post.uuid).update(status=PostStatus.REJECTED)
+
+    job.save(update_fields=["status", "error", "locked_at", "available_at", "updated_at"])
+
+
+def _next_stage(stage: str) -> IngestionStages:
+    index = STAGES.index(stage) + 1
+    return STAGES[index] if index < len(STAGES) else IngestionStages.DONE
+
+
+def _fetch(job: IngestionJobs, post: Posts):
+    postsyncer = Postsyncer()
+    social_media_data = retry(postsyncer.get_social_media, job.payload["url"])
+
+    owner = None
+    social_media_owner = social_media_data.get("owner")
+    if social_media_owner:
+        owner, _ = Owners.objects.get_or_create(
+            username=social_media_owner.get("username"),
+            defaults={
+                "name": social_media_owner.get("full_name", social_media_data.get("author")),
+                "is_verified": social_media_owner.get("is_verified"),
+            },
+        )
+
+    media = None
+    medias = social_media_data.get("medias")
+
+    if picture := medias.get("images", []):
+        media = {
+            "url": picture[0].get("url"),
+            "name": f"{picture[0].get('id')}.{picture[0].get('extension')}",
+            "type": PostTypes.IMAGE.value,
+        }
+
+    if movie := medias.get("videos", []):
+        media = {
+            "url": movie[0].get("url"),
+            "name": f"{movie[0].get('id')}.{movie[0].get('extension')}",
+            "type": PostTypes.VIDEO.value,
+            "thumbnail": social_media_data.get("thumbnail"),
+        }
+
+    if media is None:
+        raise ValueError("No media found for the given URL")
+
+    job.payload["media"] = media
+
+    post.owner = owner
+    post.provider = social_media_data.get("source")
+    post.external_link = social_media_data.get("url") or post.external_link
+    post.normalized_link = normalize_social_url(post.external_link)
+    post.save(update_fields=["owner", "provider", "external_link", "normalized_link", "updated_at"])
+
+    # o link canônico do Postsyncer pode ser de um post que já existe (ex.: link de compartilhamento)
+    duplicate = find_duplicate_post(exclude=post, normalized_link=post.normalized_link)
+    if duplicate and duplicate.status == PostStatus.APPROVED:
+        return _clone_post(post, duplicate)
+
+
+def _store_media(job: IngestionJobs, post: Posts):
+    if post.media:
+        return _check_uploaded_media(job, post)
+
+    media = job.payload["media"]
+
+    with download_file(media["url"], media["name"]) as file:
+        # mesmo arquivo de um post já processado: reaproveita sem gravar no storage nem chamar a IA
+        duplicate = find_duplicate_post(exclude=post, media_hash=file.sha256)
+        if duplicate and duplicate.status == PostStatus.APPROVED:
+            return _clone_post(post, duplicate)
+
+        post.type = media["type"]
+        post.media_hash = file.sha256
+        post.media.save(file.name, file, save=False)
+        media["size"] = file.size
+
+    post.save(update_fields=["type", "media", "media_hash", "updated_at"])
+
+
+def _check_uploaded_media(job: IngestionJobs, post: Posts):
+    """
+    Upload direto: a mídia já está no storage, então só confere o conteúdo real e calcula o hash.
+    """
+    with post.media.open("rb"):
+        content_type = detect_content_type(post.media.read(32))
+        if content_type != job.payload.get("content_type"):
+            raise ValueError(f"Uploaded file content does not match {job.payload.get('content_type')}")
+        media_hash = file_sha256(post.media)
+
+    duplicate = find_duplicate_post(exclude=post, media_hash=media_hash)
+    if duplicate and duplicate.status == PostStatus.APPROVED:
+        uploaded = post.media.name
+        next_stage = _clone_post(post, duplicate)
+        post.media.storage.delete(uploaded)
+        return next_stage
+
+    post.media_hash = media_hash
+    post.save(update_fields=["media_hash", "updated_at"])
+
+
+def _thumbnail(job: IngestionJobs, post: Posts):
+    if post.type != PostTypes.VIDEO:
+        return
+
+    thumbnail_url = job.payload.get("media", {}).get("thumbnail")
+    if thumbnail_url:
+        with download_file(thumbnail_url, "thumbnail.png", max_size=settings.MEDIA_MAX_THUMBNAIL_SIZE) as thumbnail:
+            post.thumbnail.save(thumbnail.name, thumbnail, save=False)
+    else:
+        thumbnail = generate_video_thumbnail_from_upload(post.media)
+        post.thumbnail.save(thumbnail.name, thumbnail, save=False)
+
+    post.save(update_fields=["thumbnail", "updated_at"])
+
+
+def _renditions(job: IngestionJobs, post: Posts):
+    post.generate_renditions()
+
+
+def _phash(job: IngestionJobs, post: Posts):
+    file = post.thumbnail if post.thumbnail else post.media
+    with file.open("rb"):
+        post.phash = dhash(file)
+    post.phash_bands = hash_bands(post.phash)
+    post.save(update_fields=["phash", "phash_bands", "updated_at"])
+
+    # meme repostado (reencode, corte, marca d'água): reaproveita os metadados de IA do original
+    similar = find_similar_post(post.phash, exclude=post)
+    if similar:
+        return _clone_post(post, similar, copy_media=False)
+
+
+def _vision(job: IngestionJobs, post: Posts):
+    payload = post.vision_payload()
+    if payload is None:
+        raise ValueError("Post has no media to send to the vision AI")
+
+    image, mime_type = payload
+    data = get_vision_metadata(image, post.media_hash, mime_type=mime_type)
+
+    job.payload["keywords"] = data.get("keywords", [])
+
+    post.title = data.get("title")
+    post.description = data.get("description")
+    post.save(update_fields=["title", "description", "updated_at"])
+
+
+def _embedding(job: IngestionJobs, post: Posts):
+    almanaque_ai = get_almanaque_ai()
+    post.embedding = almanaque_ai.get_embedding(post.description)
+    post.save(update_fields=["embedding", "updated_at"])
+
+
+def _keywords(job: IngestionJobs, post: Posts):
+    keywords = []
+    for keyword in job.payload.get("keywords", []):
+        _keyword, _ = Keywords.objects.get_or_create(name=keyword.upper())
+        keywords.append(_keyword)
+
+    with transaction.atomic():
+        post.keywords.set(keywords)
+        post.status = PostStatus.APPROVED.value
+        post.save(update_fields=["status", "updated_at"])
+        sync_post_visibility(post.uuid)
+
+
+def _clone_post(post: Posts, source: Posts, copy_media: bool = True) -> IngestionStages:
+    """
+    Copia os metadados de IA (e, para duplicatas exatas, a mídia) de um post já processado e
+    encerra a ingestão.
+    """
+    fields = ["title", "description", "embedding", "status", "updated_at"]
+    if copy_media:
+        post.type = source.type
+        post.media = source.media.name
+        post.thumbnail = source.thumbnail.name or None
+        post.rendition_files = source.rendition_files
+        post.media_hash = source.media_hash
+        post.phash = source.phash
+        post.phash_bands = source.phash_bands
+        fields += ["type", "media", "thumbnail", "rendition_files", "media_hash", "phash", "phash_bands"]
+
+    post.title = source.title
+    post.description = source.description
+    post.embedding = source.embedding
+    post.status = PostStatus.APPROVED.value
+
+    with transaction.atomic():
+        post.save(update_fields=fields)
+        post.keywords.set(source.keywords.all())
+        sync_post_visibility(post.uuid)
+
+    return IngestionStages.DONE
+
+
+STAGE_HANDLERS = {
+    IngestionStages.FETCH: _fetch,
+    IngestionStages.STORE_MEDIA: _store_media,
+    IngestionStages.THUMBNAIL: _thumbnail,
+    IngestionStages.RENDITIONS: _renditions,
+    IngestionStages.PHASH: _phash,
+    IngestionStages.VISION: _vision,
+    IngestionStages.EMBEDDING: _embedding,
+    IngestionStages.KEYWORDS: _keywords,
+}
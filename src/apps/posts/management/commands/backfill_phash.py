@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from src.apps.posts.models import Posts
+from src.utils.image import dhash, hash_bands
+
+
+class Command(BaseCommand):
+    help = "Computes the perceptual hash of the posts that do not have one yet."
+
+    def handle(self, *args, **options):
+        queryset = Posts.objects.filter(phash__isnull=True).filter(Q(thumbnail__gt="") | Q(media__gt=""))
+
+        total = queryset.count()
+        self.stdout.write(f"Hashing {total} posts...")
+
+        for post in queryset.iterator():
+            file = post.thumbnail if post.thumbnail else post.media
+            try:
+                with file.open("rb"):
+                    phash = dhash(file)
+            except Exception as e:
+                self.stderr.write(f"Post {post.uuid} could not be hashed: {e}")
+                continue
+
+            Posts.objects.filter(uuid=post.uuid).update(phash=phash, phash_bands=hash_bands(phash))
+
+        self.stdout.write(self.style.SUCCESS("Completed!"))
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
 
 from src.apps.posts.models import Posts
-from src.integrations.almanaque_ai import AlmanaqueAI
+from src.integrations.registry import get_almanaque_ai
 
 
 class Command(BaseCommand):
@@ -11,7 +11,7 @@ class Command(BaseCommand):
         queryset = Posts.objects.filter(embedding__isnull=True)
 
         total = queryset.count()
-        almanaque_ai = AlmanaqueAI()
+        almanaque_ai = get_almanaque_ai()
         self.stdout.write(f"Generating embeddings for {total} posts...")
 
         for post in queryset:
@@ -3,9 +3,7 @@ import uuid
 from django.core.management.base import BaseCommand
 
 from src.apps.posts.models import Posts
-from src.integrations.almanaque_ai import AlmanaqueAI
-from src.integrations.gemini import Gemini
-from src.integrations.openai import OpenAI
+from src.integrations.registry import get_almanaque_ai, get_gemini, get_openai
 
 
 class Command(BaseCommand):
@@ -21,7 +19,7 @@ class Command(BaseCommand):
         if not instance:
             raise ValueError(f"Post with UUID {uuid} not found.")
 
-        almanaque_ai = AlmanaqueAI()
+        almanaque_ai = get_almanaque_ai()
         self.stdout.write("Generating metadata for posts...")
 
         if not instance.description:
@@ -32,11 +30,11 @@ class Command(BaseCommand):
         almanaque_metadata = almanaque_ai.process_image(image_base64)
         print(almanaque_metadata)
 
-        openai = OpenAI()
+        openai = get_openai()
         openai_metadata = openai.process_image(image_base64)
         print(openai_metadata)
 
-        gemini = Gemini()
+        gemini = get_gemini()
         gemini_metadata = gemini.process_image(image_base64)
         print(gemini_metadata)
 
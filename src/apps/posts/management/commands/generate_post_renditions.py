@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from src.apps.posts.models import Posts
+
+
+class Command(BaseCommand):
+    help = "Generates the WebP renditions of the posts that do not have them yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Regenerate the renditions of every post")
+
+    def handle(self, *args, **options):
+        queryset = Posts.objects.filter(Q(thumbnail__gt="") | Q(media__gt=""))
+        if not options["all"]:
+            queryset = queryset.filter(rendition_files__isnull=True)
+
+        total = queryset.count()
+        self.stdout.write(f"Generating renditions for {total} posts...")
+
+        for post in queryset.iterator():
+            try:
+                post.generate_renditions()
+            except Exception as e:
+                self.stderr.write(f"Post {post.uuid} could not be processed: {e}")
+
+        self.stdout.write(self.style.SUCCESS("Completed!"))
@@ -1,7 +1,9 @@
 from django.core.management.base import BaseCommand
 
 from src.apps.posts.models import Keywords, Posts
-from src.integrations.almanaque_ai import AlmanaqueAI
+from src.apps.posts.services import get_vision_metadata
+from src.integrations.registry import get_almanaque_ai
+from src.utils.upload_file import file_sha256
 
 
 class Command(BaseCommand):
@@ -11,11 +13,20 @@ class Command(BaseCommand):
         queryset = Posts.objects.all()
 
         total = queryset.count()
-        almanaque_ai = AlmanaqueAI()
+        almanaque_ai = get_almanaque_ai()
         self.stdout.write(f"Generating data for {total} posts...")
 
         for post in queryset:
-            data = almanaque_ai.process_image(post.media_to_base64())
+            # posts ainda sem mídia (ex.: ingestão pendente ou rejeitada) não têm o que mandar para a IA
+            payload = post.vision_payload()
+            if payload is None:
+                continue
+
+            image, mime_type = payload
+            if not post.media_hash:
+                with post.media.open("rb"):
+                    post.media_hash = file_sha256(post.media)
+            data = get_vision_metadata(image, post.media_hash, almanaque_ai, mime_type=mime_type)
 
             keywords = []
             for keyword in data.get("keywords", []):
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from src.utils.cache import NamespacedCache, get_namespace
+
+
+class Command(BaseCommand):
+    help = "Invalidates every key of the given cache namespaces (e.g. media_url, postsyncer)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("namespaces", nargs="+", help="Cache namespaces to invalidate")
+
+    def handle(self, *args, **options):
+        for name in options["namespaces"]:
+            # a versão fica no próprio cache, então não depende do módulo que usa o namespace estar importado
+            namespace = get_namespace(name) or NamespacedCache(name)
+            version = namespace.invalidate()
+            self.stdout.write(f"{name}: now at version {version}")
+
+        self.stdout.write(self.style.SUCCESS("Completed!"))
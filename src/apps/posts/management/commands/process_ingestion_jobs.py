@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from src.apps.posts.ingestion import claim_jobs, process_job
+from src.integrations.registry import warm_up
+
+
+class Command(BaseCommand):
+    help = "Worker that runs the queued post ingestion jobs (media, thumbnail, vision, embedding and keywords)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5, help="Number of jobs claimed per batch")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Process the available jobs and exit")
+
+    def handle(self, *args, **options):
+        self.stdout.write("Processing ingestion jobs...")
+        warm_up()
+
+        while True:
+            jobs = claim_jobs(options["batch_size"])
+            for job in jobs:
+                process_job(job)
+
+            if jobs:
+                self.stdout.write(f"Processed {len(jobs)} jobs.")
+                continue
+
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS("Completed!"))
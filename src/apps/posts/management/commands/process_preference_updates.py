@@ -0,0 +1,60 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from src.apps.posts.models import PreferenceUpdates
+from src.apps.posts.services import apply_user_preferences_changes
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Worker that applies the queued reaction changes to the user preference embeddings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Number of users processed per batch")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Process the available updates and exit")
+
+    def handle(self, *args, **options):
+        self.stdout.write("Processing preference updates...")
+
+        while True:
+            processed = self.process_batch(options["batch_size"])
+            if processed:
+                self.stdout.write(f"Updated preferences of {processed} users.")
+                continue
+
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS("Completed!"))
+
+    def process_batch(self, batch_size: int) -> int:
+        with transaction.atomic():
+            # SKIP LOCKED permite rodar vários workers sem processar o mesmo usuário duas vezes
+            updates = list(
+                PreferenceUpdates.objects.select_for_update(skip_locked=True)
+                .filter(available_at__lte=timezone.now())
+                .order_by("available_at")[:batch_size]
+            )
+
+            for update in updates:
+                # savepoint por usuário: uma fila com erro é adiada sem desfazer as outras do lote
+                try:
+                    with transaction.atomic():
+                        apply_user_preferences_changes(update.user_id, update.changes)
+                        update.delete()
+                except Exception:
+                    logger.exception("Preference update of user %s failed", update.user_id)
+                    PreferenceUpdates.objects.filter(pk=update.pk).update(
+                        available_at=timezone.now() + timedelta(seconds=settings.PREFERENCES_RETRY_DELAY)
+                    )
+
+        return len(updates)
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from src.apps.posts.models import SearchEmbeddings
+
+
+class Command(BaseCommand):
+    help = "Removes expired search embeddings and keeps the table within its maximum size."
+
+    def handle(self, *args, **options):
+        expired_before = timezone.now() - timedelta(seconds=settings.SEARCH_EMBEDDING_CACHE_TTL)
+        expired, _ = SearchEmbeddings.objects.filter(created_at__lt=expired_before).delete()
+
+        overflow = 0
+        max_rows = settings.SEARCH_EMBEDDING_CACHE_MAX_ROWS
+        cutoff = (
+            SearchEmbeddings.objects.order_by("-created_at")
+            .values_list("created_at", flat=True)[max_rows : max_rows + 1]
+            .first()
+        )
+        if cutoff:
+            overflow, _ = SearchEmbeddings.objects.filter(created_at__lte=cutoff).delete()
+
+        self.stdout.write(self.style.SUCCESS(f"Removed {expired} expired and {overflow} overflow search embeddings."))
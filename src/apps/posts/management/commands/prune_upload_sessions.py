@@ -0,0 +1,21 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from src.apps.posts.enums import UploadStatus
+from src.apps.posts.models import UploadSessions
+
+
+class Command(BaseCommand):
+    help = "Removes expired upload sessions that were never finalized, along with any uploaded file."
+
+    def handle(self, *args, **options):
+        queryset = UploadSessions.objects.filter(status=UploadStatus.PENDING, expires_at__lt=timezone.now())
+
+        removed = 0
+        for session in queryset.iterator():
+            default_storage.delete(session.name)
+            session.delete()
+            removed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} expired upload sessions."))
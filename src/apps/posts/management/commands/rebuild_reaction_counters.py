@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from src.apps.posts.enums import REACTION_COUNTERS
+from src.apps.posts.models import Posts, ReactionCounters
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the reaction counters of every post from the reactions table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of posts written per batch")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        fields = list(REACTION_COUNTERS.values())
+        aggregates = {
+            field: Count("reactions", filter=Q(reactions__type=reaction_type))
+            for reaction_type, field in REACTION_COUNTERS.items()
+        }
+        queryset = Posts.all_objects.order_by().annotate(**aggregates).values("uuid", *fields)
+
+        total = queryset.count()
+        self.stdout.write(f"Rebuilding reaction counters for {total} posts...")
+
+        now = timezone.now()
+        batch = []
+        for row in queryset.iterator(chunk_size=batch_size):
+            batch.append(
+                ReactionCounters(post_id=row["uuid"], updated_at=now, **{field: row[field] for field in fields})
+            )
+            if len(batch) >= batch_size:
+                self._write(batch, fields)
+                batch = []
+
+        if batch:
+            self._write(batch, fields)
+
+        self.stdout.write(self.style.SUCCESS("Completed!"))
+
+    def _write(self, batch: list[ReactionCounters], fields: list[str]):
+        ReactionCounters.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["post"],
+            update_fields=[*fields, "updated_at"],
+        )
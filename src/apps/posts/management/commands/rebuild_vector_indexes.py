@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+
+from src.apps.posts.models import Posts
+from src.apps.users.models import Users
+
+VECTOR_INDEXES = [
+    (Posts, "post_visible_embedding_ann"),
+    (Users, "user_preferences_embedding_ann"),
+]
+
+LIVE_INDEX_SQL = """
+    SELECT am.amname, coalesce(class.reloptions, '{}')
+    FROM pg_class AS class
+    JOIN pg_am AS am ON am.oid = class.relam
+    WHERE class.oid = to_regclass(%s) AND class.relkind = 'i'
+"""
+
+# a troca trava a tabela; se houver consulta longa na frente, desiste em vez de enfileirar as leituras
+SWAP_LOCK_TIMEOUT = "5s"
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the vector (ANN) indexes concurrently, exactly as declared on the models. "
+        "To change the index type or its parameters, change the model and create a migration."
+    )
+
+    def handle(self, *args, **options):
+        for model, name in VECTOR_INDEXES:
+            index = next((index for index in model._meta.indexes if index.name == name), None)
+            if index is None:
+                raise CommandError(f"Index {name} not found on {model.__name__}.")
+
+            self.stdout.write(f"Rebuilding {name} ({index.__class__.__name__})...")
+            self._rebuild(model, index)
+
+        self.stdout.write(self.style.SUCCESS("Completed!"))
+
+    def _rebuild(self, model, index):
+        quote_name = connection.ops.quote_name
+
+        # mesmo tipo e parâmetros do model: o REINDEX CONCURRENTLY troca o índice sem deixar a tabela sem ele
+        if self._live_index(index.name) == self._declared_index(index):
+            with connection.cursor() as cursor:
+                cursor.execute(f"REINDEX INDEX CONCURRENTLY {quote_name(index.name)}")
+            return
+
+        # o índice no banco difere do model (ou não existe): cria a cópia declarada com outro nome, sem
+        # bloquear escritas, e troca em uma transação curta, para as consultas nunca ficarem sem índice
+        temporary_name = f"{index.name}_new"
+        new_index = index.clone()
+        new_index.name = temporary_name
+
+        with connection.schema_editor(atomic=False) as editor:
+            editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {quote_name(temporary_name)}")
+            editor.execute(new_index.create_sql(model, editor, concurrently=True))
+
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+                cursor.execute(f"DROP INDEX IF EXISTS {quote_name(index.name)}")
+                cursor.execute(f"ALTER INDEX {quote_name(temporary_name)} RENAME TO {quote_name(index.name)}")
+        except OperationalError as e:
+            raise CommandError(f"Could not swap {temporary_name} into {index.name}, run the command again: {e}")
+
+    def _live_index(self, name: str) -> tuple[str, list[str]] | None:
+        with connection.cursor() as cursor:
+            cursor.execute(LIVE_INDEX_SQL, [name])
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        method, options = row
+        return method, sorted(options)
+
+    def _declared_index(self, index) -> tuple[str, list[str]]:
+        # `get_with_params` vem como "m = 16"; no pg_class fica "m=16"
+        return index.suffix, sorted(param.replace(" ", "") for param in index.get_with_params())
@@ -0,0 +1,26 @@
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from src.apps.posts.services import recalculate_user_preferences_embedding
+from src.apps.users.models import Users
+
+
+class Command(BaseCommand):
+    help = "Recalculates the preference embedding of the users from all their reactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=uuid.UUID, help="Only recalculate this user UUID")
+
+    def handle(self, *args, **options):
+        queryset = Users.objects.filter(reactions__isnull=False).distinct()
+        if options["user"]:
+            queryset = Users.objects.filter(uuid=options["user"])
+
+        total = queryset.count()
+        self.stdout.write(f"Recalculating preferences for {total} users...")
+
+        for user in queryset.iterator():
+            recalculate_user_preferences_embedding(user)
+
+        self.stdout.write(self.style.SUCCESS("Completed!"))
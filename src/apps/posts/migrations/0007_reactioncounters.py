@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0006_posts_slug_alter_reactions_type_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReactionCounters",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        db_column="post_uuid",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="reaction_counters",
+                        serialize=False,
+                        to="posts.posts",
+                        verbose_name="Post",
+                    ),
+                ),
+                ("likes", models.IntegerField(default=0, verbose_name="Likes")),
+                ("dislikes", models.IntegerField(default=0, verbose_name="Dislikes")),
+                ("loves", models.IntegerField(default=0, verbose_name="Loves")),
+                ("laughs", models.IntegerField(default=0, verbose_name="Laughs")),
+                ("wow", models.IntegerField(default=0, verbose_name="Wow")),
+                ("sad", models.IntegerField(default=0, verbose_name="Sad")),
+                ("angry", models.IntegerField(default=0, verbose_name="Angry")),
+                ("insightful", models.IntegerField(default=0, verbose_name="Insightful")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Reaction Counter",
+                "verbose_name_plural": "Reaction Counters",
+                "db_table": "reaction_counters",
+            },
+        ),
+        # contadores dos posts que já existem, calculados a partir da tabela de reações
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO reaction_counters
+                    (post_uuid, likes, dislikes, loves, laughs, wow, sad, angry, insightful, updated_at)
+                SELECT
+                    posts.uuid,
+                    count(reactions.id) FILTER (WHERE reactions.type = 'LIKE'),
+                    count(reactions.id) FILTER (WHERE reactions.type = 'DISLIKE'),
+                    count(reactions.id) FILTER (WHERE reactions.type = 'LOVE'),
+                    count(reactions.id) FILTER (WHERE reactions.type = 'LAUGH'),
+                    count(reactions.id) FILTER (WHERE reactions.type = 'WOW'),
+                    count(reactions.id) FILTER (WHERE reactions.type = 'SAD'),
+                    count(reactions.id) FILTER (WHERE reactions.type = 'ANGRY'),
+                    count(reactions.id) FILTER (WHERE reactions.type = 'INSIGHTFUL'),
+                    now()
+                FROM posts
+                LEFT JOIN reactions ON reactions.post_uuid = posts.uuid
+                GROUP BY posts.uuid
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
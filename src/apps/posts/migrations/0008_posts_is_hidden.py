@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:24
+
+import pgvector.django.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0007_reactioncounters"),
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="posts",
+            name="post_embedding_ivfflat",
+        ),
+        migrations.AddField(
+            model_name="posts",
+            name="is_hidden",
+            field=models.BooleanField(default=False, verbose_name="Is Hidden"),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE posts SET is_hidden = TRUE
+                WHERE EXISTS (
+                    SELECT 1 FROM reports
+                    WHERE reports.post_uuid = posts.uuid AND reports.status = 'APPROVED'
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="posts",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True), ("is_hidden", False)),
+                fields=["-created_at", "-uuid"],
+                name="post_visible_created_at",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="posts",
+            index=pgvector.django.indexes.IvfflatIndex(
+                condition=models.Q(("deleted_at__isnull", True), ("is_hidden", False)),
+                fields=["embedding"],
+                lists=100,
+                name="post_visible_embedding_ivfflat",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+    ]
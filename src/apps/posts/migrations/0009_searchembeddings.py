@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:25
+
+import pgvector.django.vector
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0008_posts_is_hidden"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEmbeddings",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("query_hash", models.CharField(max_length=64, verbose_name="Query Hash")),
+                ("query", models.TextField(verbose_name="Query")),
+                ("model", models.CharField(max_length=255, verbose_name="Model")),
+                ("embedding", pgvector.django.vector.VectorField(dimensions=1536)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Search Embedding",
+                "verbose_name_plural": "Search Embeddings",
+                "db_table": "search_embeddings",
+                "ordering": ["-created_at"],
+                "indexes": [models.Index(fields=["created_at"], name="search_embe_created_5163f4_idx")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("query_hash", "model"), name="search_embedding_query_model")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:26
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0009_searchembeddings"),
+        ("users", "0004_users_preferences_embedding"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posts",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(null=True),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE posts SET search_vector =
+                    setweight(to_tsvector('portuguese', coalesce(posts.title, '')), 'A')
+                    || setweight(to_tsvector('portuguese', coalesce((
+                        SELECT string_agg(keywords.name, ' ')
+                        FROM posts_keywords
+                        JOIN keywords ON keywords.id = posts_keywords.keywords_id
+                        WHERE posts_keywords.posts_id = posts.uuid
+                    ), '')), 'A')
+                    || setweight(to_tsvector('portuguese', coalesce(posts.description, '')), 'B')
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="posts",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="post_search_vector_gin"),
+        ),
+    ]
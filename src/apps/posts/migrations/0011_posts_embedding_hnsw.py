@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:27
+
+import pgvector.django.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("posts", "0010_posts_search_vector"),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name="posts",
+            name="post_visible_embedding_ivfflat",
+        ),
+        AddIndexConcurrently(
+            model_name="posts",
+            index=pgvector.django.indexes.HnswIndex(
+                condition=models.Q(("deleted_at__isnull", True), ("is_hidden", False)),
+                ef_construction=64,
+                fields=["embedding"],
+                m=16,
+                name="post_visible_embedding_ann",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+    ]
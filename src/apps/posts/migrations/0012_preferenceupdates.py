@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0011_posts_embedding_hnsw"),
+        ("users", "0006_users_preferences_sum"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PreferenceUpdates",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        db_column="user_uuid",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="preference_updates",
+                        serialize=False,
+                        to="users.users",
+                        verbose_name="User",
+                    ),
+                ),
+                ("changes", models.JSONField(default=list, verbose_name="Changes")),
+                ("available_at", models.DateTimeField(verbose_name="Available At")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Preference Update",
+                "verbose_name_plural": "Preference Updates",
+                "db_table": "preference_updates",
+                "ordering": ["available_at"],
+                "indexes": [models.Index(fields=["available_at"], name="preference__availab_30b06f_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0012_preferenceupdates"),
+        ("users", "0006_users_preferences_sum"),
+    ]
+
+    operations = [
+        # mantém só a reação mais recente de cada (post, usuário) antes de criar a restrição e
+        # recalcula os contadores dos posts que tinham reações duplicadas
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE TEMPORARY TABLE duplicated_reaction_posts AS
+                SELECT DISTINCT post_uuid
+                FROM reactions
+                GROUP BY post_uuid, user_uuid
+                HAVING count(*) > 1
+                """,
+                """
+                DELETE FROM reactions AS duplicated
+                USING reactions AS newest
+                WHERE duplicated.post_uuid = newest.post_uuid
+                AND duplicated.user_uuid = newest.user_uuid
+                AND duplicated.id < newest.id
+                """,
+                """
+                INSERT INTO reaction_counters
+                    (post_uuid, likes, dislikes, loves, laughs, wow, sad, angry, insightful, updated_at)
+                SELECT
+                    reactions.post_uuid,
+                    count(*) FILTER (WHERE reactions.type = 'LIKE'),
+                    count(*) FILTER (WHERE reactions.type = 'DISLIKE'),
+                    count(*) FILTER (WHERE reactions.type = 'LOVE'),
+                    count(*) FILTER (WHERE reactions.type = 'LAUGH'),
+                    count(*) FILTER (WHERE reactions.type = 'WOW'),
+                    count(*) FILTER (WHERE reactions.type = 'SAD'),
+                    count(*) FILTER (WHERE reactions.type = 'ANGRY'),
+                    count(*) FILTER (WHERE reactions.type = 'INSIGHTFUL'),
+                    now()
+                FROM reactions
+                JOIN duplicated_reaction_posts ON duplicated_reaction_posts.post_uuid = reactions.post_uuid
+                GROUP BY reactions.post_uuid
+                ON CONFLICT (post_uuid) DO UPDATE SET
+                    likes = EXCLUDED.likes,
+                    dislikes = EXCLUDED.dislikes,
+                    loves = EXCLUDED.loves,
+                    laughs = EXCLUDED.laughs,
+                    wow = EXCLUDED.wow,
+                    sad = EXCLUDED.sad,
+                    angry = EXCLUDED.angry,
+                    insightful = EXCLUDED.insightful,
+                    updated_at = EXCLUDED.updated_at
+                """,
+                "DROP TABLE duplicated_reaction_posts",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="reactions",
+            constraint=models.UniqueConstraint(fields=("post", "user"), name="reaction_post_user"),
+        ),
+    ]
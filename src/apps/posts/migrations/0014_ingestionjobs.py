@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:34
+
+import django.db.models.deletion
+import django.utils.timezone
+import src.apps.posts.enums
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0013_reaction_post_user"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestionJobs",
+            fields=[
+                (
+                    "uuid",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Unique Identifier",
+                    ),
+                ),
+                (
+                    "stage",
+                    models.CharField(
+                        choices=[
+                            ("FETCH", "FETCH"),
+                            ("STORE_MEDIA", "STORE_MEDIA"),
+                            ("THUMBNAIL", "THUMBNAIL"),
+                            ("VISION", "VISION"),
+                            ("EMBEDDING", "EMBEDDING"),
+                            ("KEYWORDS", "KEYWORDS"),
+                            ("DONE", "DONE"),
+                        ],
+                        default=src.apps.posts.enums.IngestionStages["FETCH"],
+                        max_length=255,
+                        verbose_name="Stage",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "PENDING"),
+                            ("RUNNING", "RUNNING"),
+                            ("COMPLETED", "COMPLETED"),
+                            ("FAILED", "FAILED"),
+                        ],
+                        default=src.apps.posts.enums.IngestionStatus["PENDING"],
+                        max_length=255,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("payload", models.JSONField(default=dict, verbose_name="Payload")),
+                ("attempts", models.IntegerField(default=0, verbose_name="Attempts")),
+                ("error", models.TextField(null=True, verbose_name="Error")),
+                ("available_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="Available At")),
+                ("locked_at", models.DateTimeField(null=True, verbose_name="Locked At")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        db_column="post_uuid",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ingestion_jobs",
+                        to="posts.posts",
+                        verbose_name="Post",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ingestion Job",
+                "verbose_name_plural": "Ingestion Jobs",
+                "db_table": "ingestion_jobs",
+                "ordering": ["-created_at"],
+                "indexes": [models.Index(fields=["status", "available_at"], name="ingestion_j_status_eea51a_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:37
+
+from django.db import migrations, models
+
+from src.utils.url import normalize_social_url
+
+
+def backfill_normalized_link(apps, schema_editor):
+    Posts = apps.get_model("posts", "Posts")
+    queryset = Posts._default_manager.filter(external_link__isnull=False).only("uuid", "external_link")
+
+    batch = []
+    for post in queryset.iterator(chunk_size=1000):
+        post.normalized_link = normalize_social_url(post.external_link)
+        batch.append(post)
+        if len(batch) >= 1000:
+            Posts._default_manager.bulk_update(batch, ["normalized_link"])
+            batch = []
+
+    if batch:
+        Posts._default_manager.bulk_update(batch, ["normalized_link"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0015_create_cache_table"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posts",
+            name="media_hash",
+            field=models.CharField(max_length=64, null=True, verbose_name="Media Hash"),
+        ),
+        migrations.AddField(
+            model_name="posts",
+            name="normalized_link",
+            field=models.CharField(max_length=2048, null=True, verbose_name="Normalized Link"),
+        ),
+        migrations.RunPython(backfill_normalized_link, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="posts",
+            index=models.Index(
+                condition=models.Q(("normalized_link__isnull", False)),
+                fields=["normalized_link"],
+                name="post_normalized_link",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="posts",
+            index=models.Index(
+                condition=models.Q(("media_hash__isnull", False)), fields=["media_hash"], name="post_media_hash"
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:39
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import src.apps.posts.enums
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0016_posts_normalized_link_media_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posts",
+            name="phash",
+            field=models.BigIntegerField(null=True, verbose_name="Perceptual Hash"),
+        ),
+        migrations.AddField(
+            model_name="posts",
+            name="phash_bands",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.IntegerField(), null=True, size=4, verbose_name="Perceptual Hash Bands"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ingestionjobs",
+            name="stage",
+            field=models.CharField(
+                choices=[
+                    ("FETCH", "FETCH"),
+                    ("STORE_MEDIA", "STORE_MEDIA"),
+                    ("THUMBNAIL", "THUMBNAIL"),
+                    ("PHASH", "PHASH"),
+                    ("VISION", "VISION"),
+                    ("EMBEDDING", "EMBEDDING"),
+                    ("KEYWORDS", "KEYWORDS"),
+                    ("DONE", "DONE"),
+                ],
+                default=src.apps.posts.enums.IngestionStages["FETCH"],
+                max_length=255,
+                verbose_name="Stage",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="posts",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["phash_bands"], name="post_phash_bands_gin"),
+        ),
+    ]
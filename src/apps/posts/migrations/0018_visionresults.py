@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0017_posts_phash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VisionResults",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("media_hash", models.CharField(max_length=64, verbose_name="Media Hash")),
+                ("prompt_version", models.CharField(max_length=32, verbose_name="Prompt Version")),
+                ("title", models.CharField(max_length=255, null=True, verbose_name="Title")),
+                ("description", models.TextField(null=True, verbose_name="Description")),
+                ("keywords", models.JSONField(default=list, verbose_name="Keywords")),
+                ("provider", models.CharField(max_length=255, null=True, verbose_name="Provider")),
+                ("model", models.CharField(max_length=255, null=True, verbose_name="Model")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Vision Result",
+                "verbose_name_plural": "Vision Results",
+                "db_table": "vision_results",
+                "ordering": ["-created_at"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("media_hash", "prompt_version"), name="vision_result_media_prompt")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:41
+
+import src.utils.upload_file
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0018_visionresults"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posts",
+            name="vision_image",
+            field=models.FileField(
+                null=True, upload_to=src.utils.upload_file.path_and_rename_vision_image, verbose_name="Vision Image"
+            ),
+        ),
+    ]
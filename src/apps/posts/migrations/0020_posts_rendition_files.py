@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:42
+
+import src.apps.posts.enums
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0019_posts_vision_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posts",
+            name="rendition_files",
+            field=models.JSONField(null=True, verbose_name="Renditions"),
+        ),
+        migrations.AlterField(
+            model_name="ingestionjobs",
+            name="stage",
+            field=models.CharField(
+                choices=[
+                    ("FETCH", "FETCH"),
+                    ("STORE_MEDIA", "STORE_MEDIA"),
+                    ("THUMBNAIL", "THUMBNAIL"),
+                    ("RENDITIONS", "RENDITIONS"),
+                    ("PHASH", "PHASH"),
+                    ("VISION", "VISION"),
+                    ("EMBEDDING", "EMBEDDING"),
+                    ("KEYWORDS", "KEYWORDS"),
+                    ("DONE", "DONE"),
+                ],
+                default=src.apps.posts.enums.IngestionStages["FETCH"],
+                max_length=255,
+                verbose_name="Stage",
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:46
+
+import django.db.models.deletion
+import src.apps.posts.enums
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0020_posts_rendition_files"),
+        ("users", "0006_users_preferences_sum"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UploadSessions",
+            fields=[
+                (
+                    "uuid",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Unique Identifier",
+                    ),
+                ),
+                ("post_uuid", models.UUIDField(unique=True, verbose_name="Post UUID")),
+                ("name", models.CharField(max_length=1024, verbose_name="Name")),
+                ("content_type", models.CharField(max_length=255, verbose_name="Content Type")),
+                ("max_size", models.BigIntegerField(verbose_name="Max Size")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("PENDING", "PENDING"), ("COMPLETED", "COMPLETED")],
+                        default=src.apps.posts.enums.UploadStatus["PENDING"],
+                        max_length=255,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("expires_at", models.DateTimeField(verbose_name="Expires At")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_column="user_uuid",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="upload_sessions",
+                        to="users.users",
+                        verbose_name="User",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Upload Session",
+                "verbose_name_plural": "Upload Sessions",
+                "db_table": "upload_sessions",
+                "ordering": ["-created_at"],
+                "indexes": [models.Index(fields=["status", "expires_at"], name="upload_sess_status_bb43bc_idx")],
+            },
+        ),
+    ]
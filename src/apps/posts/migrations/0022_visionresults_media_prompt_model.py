@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0021_uploadsessions"),
+    ]
+
+    operations = [
+        # os resultados antigos estão na chave do hash da imagem reduzida, que não é mais consultada
+        migrations.RunSQL(
+            sql="DELETE FROM vision_results",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RemoveConstraint(
+            model_name="visionresults",
+            name="vision_result_media_prompt",
+        ),
+        migrations.AddConstraint(
+            model_name="visionresults",
+            constraint=models.UniqueConstraint(
+                fields=("media_hash", "prompt_version", "model"), name="vision_result_media_prompt_model"
+            ),
+        ),
+    ]
@@ -1,20 +1,36 @@
 import base64
 import uuid
 
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from pgvector.django import IvfflatIndex, VectorField
+from pgvector.django import HnswIndex, VectorField
 
 from src.apps.posts.enums import (
+    INGESTION_STAGES,
+    INGESTION_STATUS,
     POST_STATUS,
+    UPLOAD_STATUS,
     POST_TYPES,
     REACTION_TYPES,
+    IngestionStages,
+    IngestionStatus,
     PostStatus,
-    ReactionTypes,
+    UploadStatus,
 )
 from src.utils.models import SoftDeleteModel
 from src.utils.string import generate_random
-from src.utils.upload_file import path_and_rename_media, path_and_rename_thumbnail
+from src.utils.image import image_mime_type, make_renditions, make_vision_image
+from src.utils.upload_file import (
+    path_and_rename_media,
+    path_and_rename_rendition,
+    path_and_rename_thumbnail,
+    path_and_rename_vision_image,
+)
 
 
 class Keywords(models.Model):
@@ -41,11 +57,19 @@ class Posts(SoftDeleteModel):
     status = models.CharField(null=True, choices=POST_STATUS, default=PostStatus.PENDING, verbose_name=_("Status"))
     thumbnail = models.FileField(null=True, upload_to=path_and_rename_thumbnail, verbose_name=_("Thumbnail"))
     media = models.FileField(null=True, upload_to=path_and_rename_media, verbose_name=_("Media"))
+    rendition_files = models.JSONField(null=True, verbose_name=_("Renditions"))
+    vision_image = models.FileField(null=True, upload_to=path_and_rename_vision_image, verbose_name=_("Vision Image"))
     provider = models.CharField(null=True, max_length=255, verbose_name=_("Provider"))
     external_link = models.URLField(null=True, verbose_name=_("External Link"))
+    normalized_link = models.CharField(null=True, max_length=2048, verbose_name=_("Normalized Link"))
+    media_hash = models.CharField(null=True, max_length=64, verbose_name=_("Media Hash"))
+    phash = models.BigIntegerField(null=True, verbose_name=_("Perceptual Hash"))
+    phash_bands = ArrayField(models.IntegerField(), size=4, null=True, verbose_name=_("Perceptual Hash Bands"))
     metadata = models.JSONField(null=True)
+    is_hidden = models.BooleanField(default=False, verbose_name=_("Is Hidden"))
     keywords = models.ManyToManyField("posts.Keywords", related_name="posts")
     embedding = VectorField(dimensions=1536, null=True)
+    search_vector = SearchVectorField(null=True)
     owner = models.ForeignKey(
         "posts.Owners",
         null=True,
@@ -72,12 +96,31 @@ class Posts(SoftDeleteModel):
             models.Index(fields=["created_at"]),
             models.Index(fields=["type"]),
             models.Index(fields=["status"]),
-            IvfflatIndex(
-                name="post_embedding_ivfflat",
+            models.Index(
+                name="post_visible_created_at",
+                fields=["-created_at", "-uuid"],
+                condition=models.Q(is_hidden=False, deleted_at__isnull=True),
+            ),
+            HnswIndex(
+                name="post_visible_embedding_ann",
                 fields=["embedding"],
-                lists=100,
+                m=16,
+                ef_construction=64,
                 opclasses=["vector_cosine_ops"],
+                condition=models.Q(is_hidden=False, deleted_at__isnull=True),
+            ),
+            GinIndex(name="post_search_vector_gin", fields=["search_vector"]),
+            models.Index(
+                name="post_normalized_link",
+                fields=["normalized_link"],
+                condition=models.Q(normalized_link__isnull=False),
+            ),
+            models.Index(
+                name="post_media_hash",
+                fields=["media_hash"],
+                condition=models.Q(media_hash__isnull=False),
             ),
+            GinIndex(name="post_phash_bands_gin", fields=["phash_bands"]),
         ]
 
     def save(self, *args, **kwargs):
@@ -90,19 +133,69 @@ class Posts(SoftDeleteModel):
     def __str__(self):
         return f"{self.uuid}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # guarda o embedding persistido para os signals só recalcularem as preferências quando ele muda
+        if "embedding" in field_names:
+            instance._old_embedding = instance.embedding
+        return instance
+
     @property
     def reactions_summary(self):
-        reactions = self.reactions.all()
+        try:
+            counters = self.reaction_counters
+        except ReactionCounters.DoesNotExist:
+            counters = ReactionCounters()
         return {
-            "likes": reactions.filter(type=ReactionTypes.LIKE).count(),
-            "loves": reactions.filter(type=ReactionTypes.LOVE).count(),
-            "laughs": reactions.filter(type=ReactionTypes.LAUGH).count(),
-            "wow": reactions.filter(type=ReactionTypes.WOW).count(),
-            "sad": reactions.filter(type=ReactionTypes.SAD).count(),
-            "angry": reactions.filter(type=ReactionTypes.ANGRY).count(),
-            "insightful": reactions.filter(type=ReactionTypes.INSIGHTFUL).count(),
+            "likes": counters.likes,
+            "loves": counters.loves,
+            "laughs": counters.laughs,
+            "wow": counters.wow,
+            "sad": counters.sad,
+            "angry": counters.angry,
+            "insightful": counters.insightful,
         }
 
+    @property
+    def renditions(self):
+        if not self.rendition_files:
+            return None
+        urls = self.media.storage.url_many(self.rendition_files.values())
+        return {width: urls[name] for width, name in self.rendition_files.items()}
+
+    def media_file_names(self) -> list[str]:
+        """
+        Arquivos cujas URLs aparecem no PostSchema (usado para resolver as URLs da página em lote).
+        """
+        names = [self.media.name, self.thumbnail.name]
+        if self.rendition_files:
+            names.extend(self.rendition_files.values())
+        return [name for name in names if name]
+
+    def generate_renditions(self):
+        """
+        Gera as renditions em WebP (RENDITION_WIDTHS) a partir da thumbnail (vídeos) ou da mídia.
+        """
+        f = self.thumbnail if self.thumbnail else self.media
+        if not f:
+            return None
+
+        f.open("rb")
+        try:
+            renditions = make_renditions(f, settings.RENDITION_WIDTHS)
+        finally:
+            f.close()
+
+        storage = self.media.storage
+        self.rendition_files = {}
+        for width, content in renditions.items():
+            name = path_and_rename_rendition(self, content.name)
+            storage.delete(name)
+            self.rendition_files[str(width)] = storage.save(name, content)
+
+        self.__class__.all_objects.filter(uuid=self.uuid).update(rendition_files=self.rendition_files)
+
     def media_to_base64(self):
         f = self.thumbnail if self.thumbnail else self.media
         if not f:
@@ -114,6 +207,34 @@ class Posts(SoftDeleteModel):
             f.close()
         return base64.b64encode(data).decode("utf-8")
 
+    def vision_payload(self) -> tuple[str, str] | None:
+        """
+        Imagem enviada para as IAs de visão (base64, mime type). A versão reduzida é gerada a partir
+        da thumbnail ou da mídia na primeira chamada e fica salva em `vision_image`.
+        """
+        if self.vision_image:
+            self.vision_image.open("rb")
+            try:
+                data = self.vision_image.read()
+            finally:
+                self.vision_image.close()
+            return base64.b64encode(data).decode("utf-8"), image_mime_type(self.vision_image.name)
+
+        f = self.thumbnail if self.thumbnail else self.media
+        if not f:
+            return None
+
+        f.open("rb")
+        try:
+            image = make_vision_image(f)
+        finally:
+            f.close()
+
+        data = image.read()
+        self.vision_image.save(image.name, image, save=False)
+        self.__class__.all_objects.filter(uuid=self.uuid).update(vision_image=self.vision_image.name)
+        return base64.b64encode(data).decode("utf-8"), image_mime_type(self.vision_image.name)
+
 
 class Owners(models.Model):
     username = models.CharField(max_length=255, verbose_name=_("Username"))
@@ -156,6 +277,9 @@ class Reactions(models.Model):
         verbose_name = _("Reaction")
         verbose_name_plural = _("Reactions")
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["post", "user"], name="reaction_post_user"),
+        ]
         indexes = [
             models.Index(fields=["type"]),
             models.Index(fields=["created_at"]),
@@ -164,6 +288,41 @@ class Reactions(models.Model):
     def __str__(self):
         return f"{self.uuid} - {self.type}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # guarda o tipo persistido para os signals calcularem a diferença
+        instance._old_type = instance.type
+        return instance
+
+
+class ReactionCounters(models.Model):
+    post = models.OneToOneField(
+        "posts.Posts",
+        primary_key=True,
+        on_delete=models.CASCADE,
+        db_column="post_uuid",
+        related_name="reaction_counters",
+        verbose_name=_("Post"),
+    )
+    likes = models.IntegerField(default=0, verbose_name=_("Likes"))
+    dislikes = models.IntegerField(default=0, verbose_name=_("Dislikes"))
+    loves = models.IntegerField(default=0, verbose_name=_("Loves"))
+    laughs = models.IntegerField(default=0, verbose_name=_("Laughs"))
+    wow = models.IntegerField(default=0, verbose_name=_("Wow"))
+    sad = models.IntegerField(default=0, verbose_name=_("Sad"))
+    angry = models.IntegerField(default=0, verbose_name=_("Angry"))
+    insightful = models.IntegerField(default=0, verbose_name=_("Insightful"))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "reaction_counters"
+        verbose_name = _("Reaction Counter")
+        verbose_name_plural = _("Reaction Counters")
+
+    def __str__(self):
+        return f"{self.post_id}"
+
 
 # class UserKeywordPreference(models.Model):
 #     user = models.ForeignKey("users.Users", on_delete=models.CASCADE, related_name="keyword_preferences")
@@ -206,3 +365,146 @@ class Favorites(models.Model):
 
     def __str__(self):
         return f"{self.uuid}"
+
+
+class SearchEmbeddings(models.Model):
+    query_hash = models.CharField(max_length=64, verbose_name=_("Query Hash"))
+    query = models.TextField(verbose_name=_("Query"))
+    model = models.CharField(max_length=255, verbose_name=_("Model"))
+    embedding = VectorField(dimensions=1536)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "search_embeddings"
+        verbose_name = _("Search Embedding")
+        verbose_name_plural = _("Search Embeddings")
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["query_hash", "model"], name="search_embedding_query_model"),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return self.query
+
+
+class VisionResults(models.Model):
+    media_hash = models.CharField(max_length=64, verbose_name=_("Media Hash"))
+    prompt_version = models.CharField(max_length=32, verbose_name=_("Prompt Version"))
+    title = models.CharField(null=True, max_length=255, verbose_name=_("Title"))
+    description = models.TextField(null=True, verbose_name=_("Description"))
+    keywords = models.JSONField(default=list, verbose_name=_("Keywords"))
+    provider = models.CharField(null=True, max_length=255, verbose_name=_("Provider"))
+    model = models.CharField(null=True, max_length=255, verbose_name=_("Model"))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "vision_results"
+        verbose_name = _("Vision Result")
+        verbose_name_plural = _("Vision Results")
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["media_hash", "prompt_version", "model"], name="vision_result_media_prompt_model"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.media_hash} - {self.prompt_version}"
+
+
+class PreferenceUpdates(models.Model):
+    user = models.OneToOneField(
+        "users.Users",
+        primary_key=True,
+        on_delete=models.CASCADE,
+        db_column="user_uuid",
+        related_name="preference_updates",
+        verbose_name=_("User"),
+    )
+    changes = models.JSONField(default=list, verbose_name=_("Changes"))
+    available_at = models.DateTimeField(verbose_name=_("Available At"))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "preference_updates"
+        verbose_name = _("Preference Update")
+        verbose_name_plural = _("Preference Updates")
+        ordering = ["available_at"]
+        indexes = [
+            models.Index(fields=["available_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}"
+
+
+class IngestionJobs(models.Model):
+    uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, verbose_name=_("Unique Identifier"))
+    post = models.ForeignKey(
+        "posts.Posts",
+        on_delete=models.CASCADE,
+        db_column="post_uuid",
+        related_name="ingestion_jobs",
+        verbose_name=_("Post"),
+    )
+    stage = models.CharField(
+        max_length=255, choices=INGESTION_STAGES, default=IngestionStages.FETCH, verbose_name=_("Stage")
+    )
+    status = models.CharField(
+        max_length=255, choices=INGESTION_STATUS, default=IngestionStatus.PENDING, verbose_name=_("Status")
+    )
+    payload = models.JSONField(default=dict, verbose_name=_("Payload"))
+    attempts = models.IntegerField(default=0, verbose_name=_("Attempts"))
+    error = models.TextField(null=True, verbose_name=_("Error"))
+    available_at = models.DateTimeField(default=timezone.now, verbose_name=_("Available At"))
+    locked_at = models.DateTimeField(null=True, verbose_name=_("Locked At"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "ingestion_jobs"
+        verbose_name = _("Ingestion Job")
+        verbose_name_plural = _("Ingestion Jobs")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "available_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.uuid} - {self.stage}"
+
+
+class UploadSessions(models.Model):
+    uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, verbose_name=_("Unique Identifier"))
+    post_uuid = models.UUIDField(unique=True, verbose_name=_("Post UUID"))
+    name = models.CharField(max_length=1024, verbose_name=_("Name"))
+    content_type = models.CharField(max_length=255, verbose_name=_("Content Type"))
+    max_size = models.BigIntegerField(verbose_name=_("Max Size"))
+    status = models.CharField(
+        max_length=255, choices=UPLOAD_STATUS, default=UploadStatus.PENDING, verbose_name=_("Status")
+    )
+    expires_at = models.DateTimeField(verbose_name=_("Expires At"))
+    user = models.ForeignKey(
+        "users.Users",
+        on_delete=models.CASCADE,
+        db_column="user_uuid",
+        related_name="upload_sessions",
+        verbose_name=_("User"),
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "upload_sessions"
+        verbose_name = _("Upload Session")
+        verbose_name_plural = _("Upload Sessions")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "expires_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.uuid}"
@@ -5,7 +5,7 @@ from django.utils.translation import gettext_lazy as _
 from ninja import Field, Schema
 from pydantic import UUID4, ConfigDict
 
-from src.apps.posts.enums import PostStatus, PostTypes, ReactionTypes
+from src.apps.posts.enums import IngestionStages, IngestionStatus, PostStatus, PostTypes, ReactionTypes
 from src.apps.reports.enums import ReportReasons, ReportStatus
 
 
@@ -53,8 +53,9 @@ class PostSchema(Schema):
     description: str | None = Field(None, description=_("Description"))
     type: PostTypes | None = Field(None, description=_("Type"))
     status: PostStatus | None = Field(None, description=_("Status"))
-    media: str = Field(..., description=_("File"))
+    media: str | None = Field(None, description=_("File"))
     thumbnail: str | None = Field(None, description=_("Thumbnail"))
+    renditions: dict[str, str] | None = Field(None, description=_("Renditions (WebP URL by width)"))
     provider: str | None = Field(None, description=_("Provider"))
     external_link: str | None = Field(None, description=_("External Link"))
     metadata: dict[str, Any] | None = Field(None, description=_("Metadata"))
@@ -70,6 +71,35 @@ class PostSchema(Schema):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PostIngestionSchema(Schema):
+    uuid: UUID4 = Field(..., description=_("Unique Identifier"))
+    status: PostStatus | None = Field(None, description=_("Status"))
+    stage: IngestionStages | None = Field(None, description=_("Stage"))
+    job_status: IngestionStatus | None = Field(None, description=_("Job Status"))
+    attempts: int = Field(0, description=_("Attempts"))
+    error: str | None = Field(None, description=_("Error"))
+    updated_at: datetime | None = Field(None, description=_("Updated At"))
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UploadSessionFormSchema(Schema):
+    content_type: str = Field(..., description=_("Content Type"))
+    size: int = Field(..., gt=0, description=_("Size in bytes"))
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UploadSessionSchema(Schema):
+    uuid: UUID4 = Field(..., description=_("Unique Identifier"))
+    upload_url: str = Field(..., description=_("Upload URL"))
+    method: str = Field(..., description=_("HTTP Method"))
+    headers: dict[str, str] = Field(..., description=_("Headers to send with the upload"))
+    expires_at: datetime = Field(..., description=_("Expires At"))
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class PostUpdateFormSchema(Schema):
     title: str = Field(..., description=_("Title"))
     description: str = Field(..., description=_("Description"))
@@ -123,6 +153,13 @@ class ReactionFormSchema(Schema):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ReactionBatchItemSchema(Schema):
+    post_uuid: UUID4 = Field(..., description=_("Post UUID"))
+    type: ReactionTypes | None = Field(None, description=_("Type"))
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class PostReportSchema(Schema):
     reason: ReportReasons = Field(..., description=_("Reason"))
     status: ReportStatus = Field(..., description=_("Status"))
@@ -1,64 +1,505 @@
-import math
+import hashlib
+import json
+from collections import defaultdict
+from datetime import timedelta
 
-from src.apps.posts.enums import REACTION_WEIGHTS
+import numpy as np
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, QuerySet, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+from pgvector.django import CosineDistance
+
+from src.apps.posts.enums import REACTION_COUNTERS, REACTION_WEIGHTS
 from src.apps.users.models import Users
+from src.integrations.almanaque_ai import AlmanaqueAI
+from src.integrations.openai import OpenAI
+from src.integrations.registry import get_almanaque_ai, get_openai
+from src.integrations.prompts import VISION_PROMPT_VERSION
+from src.utils.lru import LRUCache
+from src.utils.vector import set_vector_search_params
+
+from .models import Posts, Reactions, SearchEmbeddings, VisionResults
+
+PREFERENCES_EPSILON = 1e-9
 
-from .models import Reactions
+_search_embeddings = LRUCache(
+    max_size=settings.SEARCH_EMBEDDING_CACHE_SIZE,
+    ttl=settings.SEARCH_EMBEDDING_CACHE_TTL,
+)
 
 
-def _weighted_mean_normalized(vectors: list[list[float]], weights: list[float]) -> list[float] | None:
-    if not vectors:
+def _normalize(vector: np.ndarray | None, weight: float) -> np.ndarray | None:
+    # média ponderada normalizada (norma 1.0), dividir pelo peso não muda a direção
+    if vector is None or weight <= PREFERENCES_EPSILON:
+        return None
+
+    norm = float(np.linalg.norm(vector))
+    if norm <= PREFERENCES_EPSILON:
         return None
 
-    dimensions = len(vectors[0])
-    agg = [0.0] * dimensions
+    return vector / norm
+
+
+def _save_user_preferences(user: Users, vector: np.ndarray | None, weight: float) -> None:
+    if vector is None or abs(weight) <= PREFERENCES_EPSILON:
+        vector, weight = None, 0.0
+
+    user.preferences_sum = vector
+    user.preferences_weight = weight
+    user.preferences_embedding = _normalize(vector, weight)
+    user.save(update_fields=["preferences_sum", "preferences_weight", "preferences_embedding"])
+
+
+def recalculate_user_preferences_embedding(user: Users) -> None:
+    """
+    Recalcula do zero a soma ponderada, o peso total e o embedding de preferências do usuário
+    a partir de todas as reações. Usado como reparo, o caminho normal é o incremental.
+    """
+    reactions = Reactions.objects.filter(user=user).exclude(post__embedding=None).values_list("type", "post__embedding")
+
+    vector = None
     total_weight = 0.0
 
-    for vector, weight in zip(vectors, weights):
+    for reaction_type, embedding in reactions.iterator():
+        weight = REACTION_WEIGHTS.get(reaction_type, 0.0)
         if weight == 0:
             continue
+
+        contribution = weight * np.asarray(embedding, dtype=np.float64)
+        vector = contribution if vector is None else vector + contribution
         total_weight += abs(weight)
-        for dimension in range(dimensions):
-            agg[dimension] += weight * vector[dimension]
 
-    if total_weight == 0:
-        return None
+    _save_user_preferences(user, vector, total_weight)
 
-    # média ponderada
-    avg = [v / total_weight for v in agg]
 
-    # normaliza (norma 1.0)
-    normalize = math.sqrt(sum(x * x for x in avg))
-    if normalize == 0:
-        return None
+PREFERENCE_UPDATES_SQL = """
+    INSERT INTO preference_updates (user_uuid, changes, available_at, created_at)
+    VALUES (%(user)s, %(changes)s::jsonb, now() + make_interval(secs => %(delay)s), now())
+    ON CONFLICT (user_uuid) DO UPDATE SET changes = preference_updates.changes || EXCLUDED.changes
+"""
+
 
-    return [x / normalize for x in avg]
+def enqueue_user_preferences_update(user_id, post_id, old_type: str | None, new_type: str | None) -> None:
+    """
+    Registra a mudança de reação na fila do usuário com um único upsert. Mudanças feitas antes
+    do worker processar a fila são acumuladas na mesma linha e aplicadas juntas.
+    """
+    if REACTION_WEIGHTS.get(old_type, 0.0) == REACTION_WEIGHTS.get(new_type, 0.0):
+        return
 
+    changes = [{"post": str(post_id), "old": old_type, "new": new_type}]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            PREFERENCE_UPDATES_SQL,
+            {"user": user_id, "changes": json.dumps(changes), "delay": settings.PREFERENCES_UPDATE_DELAY},
+        )
 
-def recalculate_user_preferences_embedding(user: Users) -> None:
-    reactions = Reactions.objects.select_related("post").filter(user=user).exclude(post__embedding=None)
 
-    if not reactions.exists():
-        user.preferences_embedding = None
-        user.save(update_fields=["preferences_embedding"])
+PREFERENCE_RECALCULATIONS_SQL = """
+    INSERT INTO preference_updates (user_uuid, changes, available_at, created_at)
+    SELECT reactions.user_uuid, %(changes)s::jsonb, now() + make_interval(secs => %(delay)s), now()
+    FROM reactions
+    WHERE reactions.post_uuid = %(post)s AND reactions.type = ANY(%(types)s)
+    ON CONFLICT (user_uuid) DO UPDATE SET changes = preference_updates.changes || EXCLUDED.changes
+"""
+
+
+def enqueue_user_preferences_recalculation(post_id) -> None:
+    """
+    Enfileira o recálculo completo das preferências de quem reagiu ao post. Usado quando o embedding
+    do post muda: a soma guardada foi feita com o embedding antigo e o delta incremental usaria o novo.
+    """
+    types = [reaction_type for reaction_type, weight in REACTION_WEIGHTS.items() if weight != 0]
+    changes = [{"post": str(post_id), "recalculate": True}]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            PREFERENCE_RECALCULATIONS_SQL,
+            {
+                "post": post_id,
+                "types": types,
+                "changes": json.dumps(changes),
+                "delay": settings.PREFERENCES_UPDATE_DELAY,
+            },
+        )
+
+
+def apply_user_preferences_changes(user_id, changes: list[dict]) -> None:
+    """
+    Aplica as mudanças de reação acumuladas na soma ponderada do usuário, em O(posts × dimensões),
+    sem reler as outras reações. Várias mudanças no mesmo post viram uma só (primeiro tipo -> último tipo).
+    Se algum post reagido mudou de embedding no meio tempo, refaz o cálculo completo.
+    """
+    if any(change.get("recalculate") for change in changes):
+        with transaction.atomic():
+            user = Users.objects.select_for_update().filter(pk=user_id).first()
+            if user is not None:
+                recalculate_user_preferences_embedding(user)
         return
 
-    vectors: list[list[float]] = []
-    weights: list[float] = []
+    net_changes: dict[str, list[str | None]] = {}
+    for change in changes:
+        if change["post"] in net_changes:
+            net_changes[change["post"]][1] = change["new"]
+        else:
+            net_changes[change["post"]] = [change["old"], change["new"]]
 
-    for reaction in reactions:
-        weight = REACTION_WEIGHTS.get(reaction.type, 0.0)
-        if weight == 0:
-            continue
+    deltas = {
+        post_id: REACTION_WEIGHTS.get(new_type, 0.0) - REACTION_WEIGHTS.get(old_type, 0.0)
+        for post_id, (old_type, new_type) in net_changes.items()
+    }
+    deltas = {post_id: delta for post_id, delta in deltas.items() if delta != 0}
+    if not deltas:
+        return
+
+    embeddings = {
+        str(post_id): embedding
+        for post_id, embedding in Posts.all_objects.filter(pk__in=list(deltas)).values_list("pk", "embedding")
+    }
+
+    with transaction.atomic():
+        user = Users.objects.select_for_update().filter(pk=user_id).first()
+        if user is None:
+            return
+
+        # faz o recálculo completo quando não há soma armazenada (usuário novo ou anterior ao cálculo
+        # incremental) ou quando algum post já foi apagado e não dá mais para descontar o embedding dele
+        if user.preferences_sum is None or len(embeddings) < len(deltas):
+            recalculate_user_preferences_embedding(user)
+            return
+
+        vector = np.asarray(user.preferences_sum, dtype=np.float64)
+        weight = user.preferences_weight
+        for post_id, embedding in embeddings.items():
+            # posts sem embedding não entram na soma nem no peso
+            if embedding is None:
+                continue
+
+            old_type, new_type = net_changes[post_id]
+            vector = vector + deltas[post_id] * np.asarray(embedding, dtype=np.float64)
+            weight += abs(REACTION_WEIGHTS.get(new_type, 0.0)) - abs(REACTION_WEIGHTS.get(old_type, 0.0))
+
+        _save_user_preferences(user, vector, weight)
+
+
+def update_reaction_counters(post_id, old_type: str | None, new_type: str | None) -> None:
+    """
+    Aplica a diferença de uma reação (criada, alterada ou removida) nos contadores do post
+    com um único comando.
+    """
+    if old_type == new_type:
+        return
+
+    old_field = REACTION_COUNTERS.get(old_type)
+    new_field = REACTION_COUNTERS.get(new_type)
+
+    changes = []
+    if old_field:
+        changes.append(f"{old_field} = GREATEST(reaction_counters.{old_field} - 1, 0)")
+    if new_field:
+        changes.append(f"{new_field} = reaction_counters.{new_field} + 1")
+    if not changes:
+        return
+
+    changes.append("updated_at = now()")
+
+    # só cria a linha quando há incremento, remoções em posts sem contador não fazem nada
+    if new_field:
+        columns = ", ".join(REACTION_COUNTERS.values())
+        values = ", ".join("1" if field == new_field else "0" for field in REACTION_COUNTERS.values())
+        sql = f"""
+            INSERT INTO reaction_counters (post_uuid, {columns}, updated_at)
+            VALUES (%s, {values}, now())
+            ON CONFLICT (post_uuid) DO UPDATE SET {", ".join(changes)}
+        """
+    else:
+        sql = f"UPDATE reaction_counters SET {', '.join(changes)} WHERE post_uuid = %s"
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [post_id])
+
+
+_COUNTER_COLUMNS = ", ".join(REACTION_COUNTERS.values())
+_COUNTER_DELTAS = ", ".join(
+    f"(changes.new_type IS NOT DISTINCT FROM '{reaction_type}')::int"
+    f" - (changes.old_type IS NOT DISTINCT FROM '{reaction_type}')::int AS {field}"
+    for reaction_type, field in REACTION_COUNTERS.items()
+)
+_COUNTER_UPDATES = ", ".join(
+    f"{field} = GREATEST(reaction_counters.{field} + deltas.{field}, 0)" for field in REACTION_COUNTERS.values()
+)
+_COUNTER_INCREMENTS = ", ".join(f"GREATEST(deltas.{field}, 0)" for field in REACTION_COUNTERS.values())
+_COUNTER_ADDS = ", ".join(
+    f"{field} = reaction_counters.{field} + EXCLUDED.{field}" for field in REACTION_COUNTERS.values()
+)
+_REACTION_WEIGHTS = ", ".join(f"('{reaction_type}', {weight})" for reaction_type, weight in REACTION_WEIGHTS.items())
+
+# a trava de cada (usuário, post) vem em um comando separado, mas na mesma ida ao banco: no READ COMMITTED
+# o snapshot de um comando é tirado antes de ele esperar a trava, então só o comando seguinte lê o que o
+# outro pedido gravou (sem isso um toque duplo conta a reação duas vezes). A ordem fixa evita deadlock.
+SET_REACTIONS_SQL = f"""
+    SELECT pg_advisory_xact_lock(hashtextextended(%(user)s::text || ':' || post_uuid, 0))
+    FROM unnest(%(posts)s::text[]) AS post_uuid;
+
+    WITH input (post_uuid, type) AS (
+        VALUES {{values}}
+    ),
+    target AS (
+        SELECT input.post_uuid, input.type
+        FROM input
+        JOIN posts ON posts.uuid = input.post_uuid AND posts.deleted_at IS NULL
+    ),
+    previous AS (
+        SELECT reactions.post_uuid, reactions.type
+        FROM reactions
+        JOIN target ON target.post_uuid = reactions.post_uuid
+        WHERE reactions.user_uuid = %(user)s
+    ),
+    upserted AS (
+        INSERT INTO reactions (post_uuid, user_uuid, type, created_at, updated_at)
+        SELECT post_uuid, %(user)s, type, now(), now() FROM target WHERE type IS NOT NULL
+        ON CONFLICT (post_uuid, user_uuid) DO UPDATE SET type = EXCLUDED.type, updated_at = EXCLUDED.updated_at
+    ),
+    deleted AS (
+        DELETE FROM reactions
+        USING target
+        WHERE reactions.post_uuid = target.post_uuid AND reactions.user_uuid = %(user)s AND target.type IS NULL
+    ),
+    changes AS (
+        SELECT target.post_uuid, previous.type AS old_type, target.type AS new_type
+        FROM target
+        LEFT JOIN previous ON previous.post_uuid = target.post_uuid
+    ),
+    deltas AS (
+        SELECT changes.post_uuid, {_COUNTER_DELTAS}
+        FROM changes
+        WHERE changes.old_type IS DISTINCT FROM changes.new_type
+    ),
+    updated_counters AS (
+        UPDATE reaction_counters
+        SET {_COUNTER_UPDATES}, updated_at = now()
+        FROM deltas
+        WHERE reaction_counters.post_uuid = deltas.post_uuid
+        RETURNING reaction_counters.post_uuid
+    ),
+    -- posts ainda sem contador recebem só os incrementos, remoções neles não fazem nada
+    inserted_counters AS (
+        INSERT INTO reaction_counters (post_uuid, {_COUNTER_COLUMNS}, updated_at)
+        SELECT deltas.post_uuid, {_COUNTER_INCREMENTS}, now()
+        FROM deltas
+        WHERE deltas.post_uuid NOT IN (SELECT post_uuid FROM updated_counters)
+        AND GREATEST({_COUNTER_COLUMNS}) > 0
+        ON CONFLICT (post_uuid) DO UPDATE SET {_COUNTER_ADDS}, updated_at = now()
+    ),
+    weights (type, weight) AS (
+        VALUES {_REACTION_WEIGHTS}
+    ),
+    preference_changes AS (
+        SELECT changes.post_uuid, changes.old_type, changes.new_type
+        FROM changes
+        LEFT JOIN weights AS old_weight ON old_weight.type = changes.old_type
+        LEFT JOIN weights AS new_weight ON new_weight.type = changes.new_type
+        WHERE COALESCE(old_weight.weight, 0) <> COALESCE(new_weight.weight, 0)
+    ),
+    queued AS (
+        INSERT INTO preference_updates (user_uuid, changes, available_at, created_at)
+        SELECT
+            %(user)s,
+            jsonb_agg(jsonb_build_object('post', post_uuid, 'old', old_type, 'new', new_type)),
+            now() + make_interval(secs => %(delay)s),
+            now()
+        FROM preference_changes
+        HAVING count(*) > 0
+        ON CONFLICT (user_uuid) DO UPDATE SET changes = preference_updates.changes || EXCLUDED.changes
+    )
+    SELECT changes.post_uuid, changes.old_type, changes.new_type
+    FROM changes
+"""
+
+
+def set_reactions(user_id, reactions: list[tuple]) -> list[tuple]:
+    """
+    Define (ou remove, quando o tipo é None) as reações do usuário em vários posts em uma única ida ao
+    banco: o mesmo comando grava as reações (INSERT ... ON CONFLICT / DELETE), aplica a diferença nos
+    contadores e enfileira as mudanças de preferência, já que os signals não são disparados.
+    Retorna (post, tipo anterior, tipo novo) dos posts existentes.
+    """
+    # o mesmo post só pode aparecer uma vez no ON CONFLICT, vale a última reação enviada
+    reactions = dict(reactions)
+    if not reactions:
+        return []
+
+    values = ", ".join(f"(%(post_{index})s::uuid, %(type_{index})s::varchar)" for index in range(len(reactions)))
+    params = {
+        "user": user_id,
+        "posts": sorted(map(str, reactions)),
+        "delay": settings.PREFERENCES_UPDATE_DELAY,
+    }
+    for index, (post_id, reaction_type) in enumerate(reactions.items()):
+        params[f"post_{index}"] = post_id
+        params[f"type_{index}"] = reaction_type
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(SET_REACTIONS_SQL.format(values=values), params)
+            cursor.nextset()
+            return cursor.fetchall()
+
+
+def normalize_search_query(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+def get_search_embedding(query: str):
+    """
+    Retorna o embedding de um texto de busca, consultando primeiro o LRU do processo,
+    depois a tabela `search_embeddings` e só então o provedor de embeddings.
+    """
+    text = normalize_search_query(query)
+    model = OpenAI.embedding_model_name
+    query_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    key = (model, query_hash)
+
+    embedding = _search_embeddings.get(key)
+    if embedding is not None:
+        return embedding
+
+    now = timezone.now()
+    embedding = (
+        SearchEmbeddings.objects.filter(
+            query_hash=query_hash,
+            model=model,
+            created_at__gte=now - timedelta(seconds=settings.SEARCH_EMBEDDING_CACHE_TTL),
+        )
+        .values_list("embedding", flat=True)
+        .first()
+    )
+
+    if embedding is None:
+        embedding = get_openai().get_embedding(text)
+        SearchEmbeddings.objects.update_or_create(
+            query_hash=query_hash,
+            model=model,
+            defaults={"query": text, "embedding": embedding, "created_at": now},
+        )
+
+    _search_embeddings.set(key, embedding)
+    return embedding
+
+
+SEARCH_VECTOR_SQL = """
+    UPDATE posts SET search_vector =
+        setweight(to_tsvector(%(config)s::regconfig, coalesce(posts.title, '')), 'A')
+        || setweight(to_tsvector(%(config)s::regconfig, coalesce((
+            SELECT string_agg(keywords.name, ' ')
+            FROM posts_keywords
+            JOIN keywords ON keywords.id = posts_keywords.keywords_id
+            WHERE posts_keywords.posts_id = posts.uuid
+        ), '')), 'A')
+        || setweight(to_tsvector(%(config)s::regconfig, coalesce(posts.description, '')), 'B')
+    WHERE posts.uuid = ANY(%(uuids)s)
+"""
+
+
+def refresh_post_search_vectors(post_ids) -> None:
+    """
+    Recalcula o tsvector (título, keywords e descrição) dos posts informados em um único UPDATE.
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(SEARCH_VECTOR_SQL, {"config": settings.SEARCH_TEXT_CONFIG, "uuids": post_ids})
+
+
+def search_posts(queryset: QuerySet, search: str) -> QuerySet:
+    """
+    Busca híbrida: full-text (tsvector) + similaridade de embeddings, combinadas por
+    reciprocal rank fusion. Consultas curtas que casam no índice de texto são respondidas
+    só por ele, sem chamar o provedor de embeddings.
+    """
+    query = SearchQuery(search, config=settings.SEARCH_TEXT_CONFIG, search_type="websearch")
+    # ts_rank devolve real, o cast para double mantém o cursor da paginação exato
+    text_matches = (
+        queryset.filter(search_vector=query)
+        .annotate(text_rank=Cast(SearchRank(F("search_vector"), query), FloatField()))
+        .order_by("-text_rank")
+    )
+
+    terms = normalize_search_query(search).split()
+    if len(terms) <= settings.SEARCH_KEYWORD_MAX_TERMS and text_matches.exists():
+        return text_matches
+
+    embedding = get_search_embedding(search)
+    candidates = settings.SEARCH_CANDIDATES
+
+    text_ids = list(text_matches.values_list("pk", flat=True)[:candidates])
+    with transaction.atomic():
+        set_vector_search_params("search")
+        vector_ids = list(
+            queryset.exclude(embedding=None)
+            .annotate(distance=CosineDistance("embedding", embedding))
+            .order_by("distance")
+            .values_list("pk", flat=True)[:candidates]
+        )
+
+    scores = defaultdict(float)
+    for ranking in (text_ids, vector_ids):
+        for position, pk in enumerate(ranking, start=1):
+            scores[pk] += 1.0 / (settings.SEARCH_RRF_K + position)
+
+    if not scores:
+        return queryset.none()
+
+    return (
+        queryset.filter(pk__in=list(scores))
+        .annotate(
+            score=Case(
+                *[When(pk=pk, then=Value(score)) for pk, score in scores.items()],
+                output_field=FloatField(),
+            ),
+            distance=CosineDistance("embedding", embedding),
+        )
+        .order_by("-score")
+    )
 
-        embedding = reaction.post.embedding
-        if not list(embedding):
-            continue
 
-        vectors.append(list(embedding))
-        weights.append(weight)
+def get_vision_metadata(
+    image_base64: str, media_hash: str, almanaque_ai: AlmanaqueAI | None = None, mime_type: str = "image/jpeg"
+) -> dict:
+    """
+    Resultado da IA de visão para a mídia, reaproveitando o da tabela `vision_results` quando o mesmo
+    arquivo (`media_hash`, sha256 do conteúdo original) já foi processado com a versão atual do prompt
+    por um dos modelos de visão configurados.
+    """
+    almanaque_ai = almanaque_ai or get_almanaque_ai()
 
-    user_vector = _weighted_mean_normalized(vectors, weights)
+    cached = VisionResults.objects.filter(
+        media_hash=media_hash,
+        prompt_version=VISION_PROMPT_VERSION,
+        model__in=almanaque_ai.vision_model_names,
+    ).first()
+    if cached is None:
+        data = almanaque_ai.process_image(image_base64, mime_type=mime_type)
+        cached, _ = VisionResults.objects.get_or_create(
+            media_hash=media_hash,
+            prompt_version=VISION_PROMPT_VERSION,
+            model=data.get("model"),
+            defaults={
+                "title": data.get("title"),
+                "description": data.get("description"),
+                "keywords": data.get("keywords", []),
+                "provider": data.get("provider"),
+            },
+        )
 
-    user.preferences_embedding = user_vector
-    user.save(update_fields=["preferences_embedding"])
+    return {
+        "title": cached.title,
+        "description": cached.description,
+        "keywords": cached.keywords,
+        "provider": cached.provider,
+        "model": cached.model,
+    }
@@ -1,9 +1,19 @@
-from django.db.models.signals import post_delete, post_save
+import numpy as np
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from src.apps.posts.services import recalculate_user_preferences_embedding
+from src.apps.posts.services import (
+    enqueue_user_preferences_recalculation,
+    enqueue_user_preferences_update,
+    refresh_post_search_vectors,
+    update_reaction_counters,
+)
+from src.apps.users.models import Users
 
-from .models import Reactions
+from .models import Posts, Reactions
+
+_NOT_LOADED = object()
 
 # @receiver(post_save, sender=Reactions)
 # def update_user_keyword_preferences_on_reaction(sender, instance, created, **kwargs):
@@ -54,13 +64,80 @@ from .models import Reactions
 
 
 @receiver(post_save, sender=Reactions)
-def update_user_embedding_on_reaction_save(sender, instance: Reactions, **kwargs):
-    recalculate_user_preferences_embedding(instance.user)
+def update_on_reaction_save(sender, instance: Reactions, created: bool, **kwargs):
+    old_type = None if created else getattr(instance, "_old_type", None)
+    update_reaction_counters(instance.post_id, old_type, instance.type)
+    enqueue_user_preferences_update(instance.user_id, instance.post_id, old_type, instance.type)
+    instance._old_type = instance.type
 
 
 @receiver(post_delete, sender=Reactions)
-def update_user_embedding_on_reaction_delete(sender, instance: Reactions, **kwargs):
-    recalculate_user_preferences_embedding(instance.user)
+def update_on_reaction_delete(sender, instance: Reactions, origin=None, **kwargs):
+    old_type = getattr(instance, "_old_type", instance.type)
+    update_reaction_counters(instance.post_id, old_type, None)
+
+    # quando o próprio usuário está sendo apagado não há preferências para atualizar
+    if not _is_deleting(origin, Users):
+        enqueue_user_preferences_update(instance.user_id, instance.post_id, old_type, None)
+
+
+def _is_deleting(origin, model) -> bool:
+    if isinstance(origin, QuerySet):
+        return origin.model is model
+    return isinstance(origin, model)
+
+
+@receiver(post_save, sender=Posts)
+def update_search_vector_on_post_save(sender, instance: Posts, update_fields=None, **kwargs):
+    if update_fields is not None and not {"title", "description"} & set(update_fields):
+        return
+    refresh_post_search_vectors([instance.pk])
+
+
+@receiver(post_save, sender=Posts)
+def recalculate_preferences_on_embedding_change(sender, instance: Posts, created: bool, update_fields=None, **kwargs):
+    # o embedding chega depois da reação na ingestão ou é refeito no PUT, e a soma de quem já
+    # reagiu ainda tem o antigo
+    if created or (update_fields is not None and "embedding" not in update_fields):
+        return
+
+    # carregado com only()/defer() e sem atribuição: o save não gravou o embedding
+    if "embedding" not in instance.__dict__:
+        return
+
+    if _embedding_changed(getattr(instance, "_old_embedding", _NOT_LOADED), instance.embedding):
+        enqueue_user_preferences_recalculation(instance.pk)
+    instance._old_embedding = instance.embedding
+
+
+def _embedding_changed(old, new) -> bool:
+    if old is _NOT_LOADED:
+        return True
+    if old is None or new is None:
+        return old is not new
+    return not np.array_equal(np.asarray(old), np.asarray(new))
+
+
+@receiver(m2m_changed, sender=Posts.keywords.through)
+def update_search_vector_on_keywords_change(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    # no clear reverso (ex.: keyword.posts.clear()) o pk_set vem vazio, então os posts afetados
+    # são guardados antes de a relação ser apagada
+    if action == "pre_clear" and reverse:
+        instance._cleared_post_ids = list(sender.objects.filter(keywords=instance).values_list("posts_id", flat=True))
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        refresh_post_search_vectors([instance.pk])
+    elif action == "post_clear":
+        post_ids = getattr(instance, "_cleared_post_ids", None)
+        if post_ids:
+            refresh_post_search_vectors(post_ids)
+        instance._cleared_post_ids = None
+    elif pk_set:
+        refresh_post_search_vectors(pk_set)
 
 
 # from django.db.models import Sum
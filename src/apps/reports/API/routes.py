@@ -2,12 +2,14 @@
 import uuid
 
 from config.auth import SupabaseJWTAuth
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from ninja import Router
 from ninja.pagination import LimitOffsetPagination, paginate
 from src.apps.reports.enums import ReportStatus
 from src.apps.reports.models import Reports
 from src.apps.reports.schemas import ReportSchema
+from src.apps.reports.services import sync_post_visibility
 from src.utils.schemas import AuthenticatedRequest
 
 router = Router(tags=["Reports"])
@@ -23,7 +25,7 @@ router = Router(tags=["Reports"])
 )
 @paginate(LimitOffsetPagination)
 def list(request: AuthenticatedRequest):
-    queryset = Reports.objects.select_related("post").all()
+    queryset = Reports.objects.select_related("post", "post__reaction_counters").all()
     return queryset
 
 
@@ -36,9 +38,11 @@ def list(request: AuthenticatedRequest):
     auth=SupabaseJWTAuth(),
 )
 def approval(request: AuthenticatedRequest, uuid: uuid.UUID):
-    instance = get_object_or_404(Reports, uuid=uuid)
-    instance.status = ReportStatus.APPROVED
-    instance.save(update_fields=["status"])
+    with transaction.atomic():
+        instance = get_object_or_404(Reports, uuid=uuid)
+        instance.status = ReportStatus.APPROVED
+        instance.save(update_fields=["status"])
+        sync_post_visibility(instance.post_id)
     return instance
 
 
@@ -51,7 +55,9 @@ def approval(request: AuthenticatedRequest, uuid: uuid.UUID):
     auth=SupabaseJWTAuth(),
 )
 def reject(request: AuthenticatedRequest, uuid: uuid.UUID):
-    instance = get_object_or_404(Reports, uuid=uuid)
-    instance.status = ReportStatus.REJECTED
-    instance.save(update_fields=["status"])
+    with transaction.atomic():
+        instance = get_object_or_404(Reports, uuid=uuid)
+        instance.status = ReportStatus.REJECTED
+        instance.save(update_fields=["status"])
+        sync_post_visibility(instance.post_id)
     return instance
@@ -0,0 +1,18 @@
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+
+from src.apps.posts.enums import PostStatus
+from src.apps.posts.models import Posts
+from src.apps.reports.enums import ReportStatus
+from src.apps.reports.models import Reports
+
+
+def sync_post_visibility(post_id) -> None:
+    """
+    Atualiza o `is_hidden` do post em um único UPDATE: fica oculto se tiver alguma denúncia aprovada
+    ou se ainda não estiver aprovado (ex.: em processamento).
+    """
+    approved_reports = Reports.objects.filter(post_id=OuterRef("pk"), status=ReportStatus.APPROVED)
+    is_hidden = ExpressionWrapper(
+        Exists(approved_reports) | ~Q(status=PostStatus.APPROVED), output_field=BooleanField()
+    )
+    Posts.all_objects.filter(uuid=post_id).update(is_hidden=is_hidden)
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:27
+
+import pgvector.django.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("users", "0004_users_preferences_embedding"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="users",
+            index=pgvector.django.indexes.HnswIndex(
+                ef_construction=64,
+                fields=["preferences_embedding"],
+                m=16,
+                name="user_preferences_embedding_ann",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+    ]
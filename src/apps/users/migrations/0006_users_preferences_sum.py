@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:28
+
+import pgvector.django.vector
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0005_users_preferences_embedding_hnsw"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="users",
+            name="preferences_sum",
+            field=pgvector.django.vector.VectorField(dimensions=1536, null=True),
+        ),
+        migrations.AddField(
+            model_name="users",
+            name="preferences_weight",
+            field=models.FloatField(default=0, verbose_name="Preferences Weight"),
+        ),
+    ]
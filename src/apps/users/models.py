@@ -2,7 +2,7 @@ import uuid
 
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from pgvector.django import VectorField
+from pgvector.django import HnswIndex, VectorField
 
 
 class Users(models.Model):
@@ -12,6 +12,8 @@ class Users(models.Model):
     avatar_url = models.CharField(max_length=255, null=True, verbose_name=_("Avatar URL"))
     external_id = models.CharField(max_length=255, verbose_name=_("External ID"))
     preferences_embedding = VectorField(dimensions=1536, null=True)
+    preferences_sum = VectorField(dimensions=1536, null=True)
+    preferences_weight = models.FloatField(default=0, verbose_name=_("Preferences Weight"))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -20,6 +22,15 @@ class Users(models.Model):
         verbose_name = _("User")
         verbose_name_plural = _("Users")
         ordering = ["name"]
+        indexes = [
+            HnswIndex(
+                name="user_preferences_embedding_ann",
+                fields=["preferences_embedding"],
+                m=16,
+                ef_construction=64,
+                opclasses=["vector_cosine_ops"],
+            ),
+        ]
 
     def __str__(self):
         return self.uuid
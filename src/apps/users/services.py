@@ -1,4 +1,10 @@
+from django.conf import settings
+
 from src.apps.users.models import Users
+from src.utils.cache import NamespacedCache
+from src.utils.schemas import AuthUserSchema
+
+_auth_users = NamespacedCache("auth_user", timeout=settings.AUTH_USER_CACHE_TTL)
 
 
 def get_user(id: str, name: str | None = None, email: str | None = None, avatar_url: str | None = None):
@@ -11,3 +17,27 @@ def get_user(id: str, name: str | None = None, email: str | None = None, avatar_
         },
     )
     return instance
+
+
+def get_auth_user(
+    id: str,
+    name: str | None = None,
+    email: str | None = None,
+    avatar_url: str | None = None,
+) -> AuthUserSchema:
+    """
+    Usuário autenticado pelo external_id do Supabase. O uuid e o nome ficam no cache compartilhado,
+    então o get_or_create só roda na primeira vez que o usuário aparece (ou depois do TTL).
+    """
+    cached = _auth_users.get(id)
+    if cached is not None:
+        return AuthUserSchema(**cached)
+
+    user = get_user(id, name, email, avatar_url)
+    _auth_users.set(id, {"uuid": str(user.uuid), "name": user.name})
+    return AuthUserSchema(uuid=user.uuid, name=user.name)
+
+
+def forget_auth_user(id: str) -> None:
+    # o próximo request do usuário volta a ler o banco (usuário apagado ou renomeado)
+    _auth_users.delete(id)
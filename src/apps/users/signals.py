@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.apps.users.services import forget_auth_user
+
+from .models import Users
+
+
+@receiver(post_save, sender=Users)
+def forget_auth_user_on_save(sender, instance: Users, created: bool, update_fields=None, **kwargs):
+    # só o que fica no cache de autenticação (uuid e nome) invalida a chave
+    if created or (update_fields is not None and not {"name", "external_id"} & set(update_fields)):
+        return
+    forget_auth_user(instance.external_id)
+
+
+@receiver(post_delete, sender=Users)
+def forget_auth_user_on_delete(sender, instance: Users, **kwargs):
+    forget_auth_user(instance.external_id)
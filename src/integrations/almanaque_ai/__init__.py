@@ -4,18 +4,28 @@ from src.utils.func_retry import retry
 
 
 class AlmanaqueAI:
-    def __init__(self):
-        self.openai = OpenAI()
-        self.gemini = Gemini()
+    def __init__(self, openai: OpenAI | None = None, gemini: Gemini | None = None):
+        # sem clientes informados cria os próprios; na aplicação use `registry.get_almanaque_ai()`
+        self.openai = openai or OpenAI()
+        self.gemini = gemini or Gemini()
 
-    def process_image(self, image: str):
+    @property
+    def vision_model_names(self) -> list[str]:
+        return [self.gemini.vision_model_name, self.openai.vision_model_name]
+
+    def process_image(self, image: str, mime_type: str = "image/jpeg"):
+        """
+        Retorna `title`, `description` e `keywords`, além de `provider` e `model` que geraram o resultado.
+        """
         response = None
         try:
-            response = retry(self.gemini.process_image, image)
+            response = retry(self.gemini.process_image, image, mime_type=mime_type)
+            response.update(provider="gemini", model=self.gemini.vision_model_name)
         except Exception as e:
             print(f"Error processing image with Gemini: {e}")
             try:
-                response = retry(self.openai.process_image, image)
+                response = retry(self.openai.process_image, image, mime_type=mime_type)
+                response.update(provider="openai", model=self.openai.vision_model_name)
             except Exception as e:
                 print(f"Error processing image with OpenAI: {e}")
                 raise Exception(f"Error processing image: {e}")
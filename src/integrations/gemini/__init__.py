@@ -5,6 +5,8 @@ import os
 from google import genai
 from google.genai import types
 
+from src.integrations.prompts import VISION_PROMPT
+
 
 class Gemini:
     """
@@ -21,7 +23,7 @@ class Gemini:
         self.vision_model_name = "gemini-2.5-flash"
         self.embedding_model_name = "gemini-embedding-001"
 
-    def process_image(self, image_base64: str) -> dict[str, any]:
+    def process_image(self, image_base64: str, mime_type: str = "image/jpeg") -> dict[str, any]:
         """
         Process an image (in base64) and return:
         {
@@ -32,6 +34,7 @@ class Gemini:
 
         :param image_base64: base64 string of the image. It could just be the base64
                              or a complete data URL (data:image/...;base64,...)
+        :param mime_type: mime type of the image (e.g. image/jpeg, image/webp)
         """
 
         if image_base64.startswith("data:"):
@@ -42,25 +45,14 @@ class Gemini:
 
             image_part = types.Part.from_bytes(
                 data=image_bytes,
-                mime_type="image/jpeg",
-            )
-
-            prompt = (
-                "Analyze the image (meme). "
-                "Identify which meme it is (if it is a famous one), describe what is happening visually "
-                "and generate tags for search. "
-                "Answer only in JSON, with the fields: "
-                "`title` (a short, catchy title in Portuguese), "
-                "`description` (a concise description of what happens in the meme, in Portuguese), and "
-                "`keywords` (a list of 5 to 10 keywords in Portuguese, including emotions, objects, famous names, and one vibe tag such as "
-                '"Engraçado", "Irônico", "Triste", "Fofo", etc.). '
+                mime_type=mime_type,
             )
 
             config = types.GenerateContentConfig(response_mime_type="application/json")
 
             response = self.client.models.generate_content(
                 model=self.vision_model_name,
-                contents=[image_part, prompt],
+                contents=[image_part, VISION_PROMPT],
                 config=config,
             )
 
@@ -3,12 +3,17 @@ import os
 
 import openai
 
+from src.integrations.prompts import VISION_PROMPT
+
 
 class OpenAI:
     """
     Uma classe para integrar com a API da OpenAI para processar imagens e extrair metadados.
     """
 
+    vision_model_name = "gpt-4o"
+    embedding_model_name = "text-embedding-3-small"
+
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -17,7 +22,7 @@ class OpenAI:
             )
         self.client = openai.OpenAI(api_key=self.api_key)
 
-    def process_image(self, base64_image: str) -> dict[str, any]:
+    def process_image(self, base64_image: str, mime_type: str = "image/jpeg") -> dict[str, any]:
         try:
             prompt_messages = [
                 {
@@ -25,24 +30,15 @@ class OpenAI:
                     "content": [
                         {
                             "type": "text",
-                            "text": (
-                                "Analyze the image (meme). "
-                                "Identify which meme it is (if it is a famous one), describe what is happening visually "
-                                "and generate tags for search. "
-                                "Answer only in JSON, with the fields: "
-                                "`title` (a short, catchy title in Portuguese), "
-                                "`description` (a concise description of what happens in the meme, in Portuguese), and "
-                                "`keywords` (a list of 5 to 10 keywords in Portuguese, including emotions, objects, famous names, and one vibe tag such as "
-                                '"Engraçado", "Irônico", "Triste", "Fofo", etc.).'
-                            ),
+                            "text": VISION_PROMPT,
                         },
-                        {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}},
+                        {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{base64_image}"}},
                     ],
                 }
             ]
 
             response = self.client.chat.completions.create(
-                model="gpt-4o",  # Modelo mais recente com capacidade de visão
+                model=self.vision_model_name,  # Modelo mais recente com capacidade de visão
                 messages=prompt_messages,
                 max_tokens=300,
                 response_format={"type": "json_object"},  # Solicita a saída em formato JSON
@@ -74,7 +70,7 @@ class OpenAI:
 
     def get_embedding(self, text: str) -> list[float]:
         response = self.client.embeddings.create(
-            model="text-embedding-3-small",
+            model=self.embedding_model_name,
             input=text,
         )
         return response.data[0].embedding
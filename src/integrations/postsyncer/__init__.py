@@ -1,4 +1,12 @@
-import requests
+import hashlib
+
+from django.conf import settings
+
+from src.utils.cache import NamespacedCache
+from src.utils.http import get_session
+from src.utils.url import normalize_social_url
+
+_cache = NamespacedCache("postsyncer", timeout=settings.POSTSYNCER_CACHE_TTL)
 
 
 class Postsyncer:
@@ -6,8 +14,22 @@ class Postsyncer:
         self.base_url = "https://postsyncer.com/api/social-media-downloader"
 
     def get_social_media(self, url: str):
+        # cache compartilhado entre os workers: o cliente costuma chamar /search e depois criar o post
+        cache_key = self.get_cache_key(url)
+        data = _cache.get(cache_key)
+        if data is not None:
+            return data
+
+        data = self.fetch_social_media(url)
+        _cache.set(cache_key, data)
+        return data
+
+    def get_cache_key(self, url: str) -> str:
+        return hashlib.sha256(normalize_social_url(url).encode()).hexdigest()
+
+    def fetch_social_media(self, url: str):
         payload = {"url": url, "platform": "all"}
-        response = requests.post(self.base_url, json=payload)
+        response = get_session().post(self.base_url, json=payload)
         if response.status_code == 200:
             data = response.json()
             if data.get("error", False):
@@ -0,0 +1,14 @@
+# Incrementar VISION_PROMPT_VERSION sempre que o prompt mudar, assim os resultados em cache
+# (tabela `vision_results`) gerados com o prompt antigo deixam de ser usados.
+VISION_PROMPT_VERSION = "1"
+
+VISION_PROMPT = (
+    "Analyze the image (meme). "
+    "Identify which meme it is (if it is a famous one), describe what is happening visually "
+    "and generate tags for search. "
+    "Answer only in JSON, with the fields: "
+    "`title` (a short, catchy title in Portuguese), "
+    "`description` (a concise description of what happens in the meme, in Portuguese), and "
+    "`keywords` (a list of 5 to 10 keywords in Portuguese, including emotions, objects, famous names, and one vibe tag such as "
+    '"Engraçado", "Irônico", "Triste", "Fofo", etc.).'
+)
@@ -0,0 +1,78 @@
+import logging
+import os
+import threading
+
+from django.conf import settings
+
+from src.integrations.almanaque_ai import AlmanaqueAI
+from src.integrations.gemini import Gemini
+from src.integrations.openai import OpenAI
+
+logger = logging.getLogger(__name__)
+
+_clients: dict[str, object] = {}
+# reentrante: o AlmanaqueAI é criado com o lock e pede os clientes da OpenAI e do Gemini
+_lock = threading.RLock()
+
+
+def get_openai() -> OpenAI:
+    return _get("openai", OpenAI)
+
+
+def get_gemini() -> Gemini:
+    return _get("gemini", Gemini)
+
+
+def get_almanaque_ai() -> AlmanaqueAI:
+    return _get("almanaque_ai", lambda: AlmanaqueAI(openai=get_openai(), gemini=get_gemini()))
+
+
+def warm_up(connect: bool | None = None) -> None:
+    """
+    Cria os clientes do processo antes da primeira requisição (ex.: no `post_worker_init` do
+    gunicorn). Com `connect` (AI_WARM_UP_CONNECT) também faz uma chamada leve a cada provedor,
+    deixando a conexão TLS aberta no pool. Falhas só são logadas: o worker sobe mesmo assim.
+    """
+    connect = settings.AI_WARM_UP_CONNECT if connect is None else connect
+
+    for name, getter, ping in (
+        ("openai", get_openai, lambda client: client.client.models.retrieve(client.embedding_model_name)),
+        ("gemini", get_gemini, lambda client: client.client.models.get(model=client.embedding_model_name)),
+    ):
+        try:
+            client = getter()
+            if connect:
+                ping(client)
+        except Exception as e:
+            logger.warning("Warm-up of %s failed: %s", name, e)
+
+    try:
+        get_almanaque_ai()
+    except Exception as e:
+        logger.warning("Warm-up of almanaque_ai failed: %s", e)
+
+
+def reset() -> None:
+    with _lock:
+        _clients.clear()
+
+
+def _get(name: str, factory):
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = factory()
+    return client
+
+
+def _after_fork() -> None:
+    # os pools de conexão (httpx) do processo pai não podem ser usados pelo filho, e o lock pode
+    # ter sido copiado travado por outra thread
+    global _lock
+    _lock = threading.RLock()
+    _clients.clear()
+
+
+os.register_at_fork(after_in_child=_after_fork)
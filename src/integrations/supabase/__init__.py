@@ -1,16 +1,22 @@
+import hashlib
 import os
 from datetime import datetime
 
 import jwt
+from django.conf import settings
 from django.utils.timezone import timezone
 from jwt import InvalidTokenError
 
-from src.apps.users.services import get_user
-from src.utils.schemas import AuthSchema, AuthUserSchema
+from src.apps.users.services import get_auth_user
+from src.utils.lru import LRUCache
+from src.utils.schemas import AuthSchema
 
 SUPABASE_JWT_SECRET = os.environ.get("SUPABASE_JWT_SECRET")
 SUPABASE_JWT_AUDIENCE = os.environ.get("SUPABASE_JWT_AUDIENCE", "authenticated")
 
+# tokens já validados neste processo (hash do token -> AuthSchema), cada um até o próprio `exp`
+_verified_tokens = LRUCache(max_size=settings.AUTH_TOKEN_CACHE_SIZE)
+
 
 def verify_supabase_token(token: str) -> AuthSchema | None:
     """
@@ -20,6 +26,12 @@ def verify_supabase_token(token: str) -> AuthSchema | None:
     if not SUPABASE_JWT_SECRET:
         raise RuntimeError("SUPABASE_JWT_SECRET não configurado no ambiente")
 
+    # a chave é o token inteiro (e não só a assinatura) para o payload também ter que bater
+    token_key = hashlib.sha256(token.encode()).hexdigest()
+    auth = _verified_tokens.get(token_key)
+    if auth is not None:
+        return auth
+
     try:
         payload = jwt.decode(
             token,
@@ -31,25 +43,26 @@ def verify_supabase_token(token: str) -> AuthSchema | None:
     except InvalidTokenError:
         return None
 
+    ttl = settings.AUTH_TOKEN_CACHE_TTL
     exp = payload.get("exp")
     if exp is not None:
         now = datetime.now(timezone.utc).timestamp()
         if now > exp:
             return None
+        ttl = min(ttl, exp - now)
 
     user_id = payload.get("sub")
     if not user_id:
         return None
 
     user_metadata = payload.get("user_metadata", {})
-    user = get_user(
+    user_auth = get_auth_user(
         user_id,
         user_metadata.get("full_name", None),
         user_metadata.get("email", None),
         user_metadata.get("avatar_url", None),
     )
-    user_auth = None
-    if user:
-        user_auth = AuthUserSchema(uuid=user.uuid, name=user.name)
 
-    return AuthSchema(user=user_auth)
+    auth = AuthSchema(user=user_auth)
+    _verified_tokens.set(token_key, auth, ttl=ttl)
+    return auth
@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+_namespaces: dict[str, "NamespacedCache"] = {}
+_namespaces_lock = threading.Lock()
+
+
+class NamespacedCache:
+    """
+    Acesso ao cache compartilhado (CACHES["default"]) sob um namespace.
+
+    As chaves ficam `<namespace>:<versão>:<chave>`; `invalidate()` troca a versão do namespace e
+    descarta todas as chaves de uma vez, sem precisar apagá-las. A versão é lida do cache no máximo
+    a cada `version_ttl` segundos por processo.
+
+    Falhas do backend (ex.: Redis fora do ar) contam como miss e não derrubam a requisição.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        timeout: int | None = DEFAULT_TIMEOUT,
+        alias: str = "default",
+        version_ttl: float = 5.0,
+    ):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.alias = alias
+        self.version_ttl = version_ttl
+
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._version_checked_at = 0.0
+        self._stats = {"hits": 0, "misses": 0, "sets": 0, "errors": 0}
+
+        with _namespaces_lock:
+            _namespaces[namespace] = self
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = self.backend.get(self.make_key(key), _MISSING)
+        except Exception:
+            self._error("get")
+            value = _MISSING
+
+        self._count("misses" if value is _MISSING else "hits")
+        return default if value is _MISSING else value
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        try:
+            full_keys = {self.make_key(key): key for key in keys}
+            found = {full_keys[full_key]: value for full_key, value in self.backend.get_many(full_keys).items()}
+        except Exception:
+            self._error("get_many")
+            found = {}
+
+        self._count("hits", len(found))
+        self._count("misses", len(set(keys)) - len(found))
+        return found
+
+    def set(self, key: str, value: Any, timeout: int | None = DEFAULT_TIMEOUT) -> None:
+        try:
+            self.backend.set(self.make_key(key), value, self._timeout(timeout))
+        except Exception:
+            self._error("set")
+            return
+        self._count("sets")
+
+    def set_many(self, data: dict[str, Any], timeout: int | None = DEFAULT_TIMEOUT) -> None:
+        if not data:
+            return
+
+        try:
+            self.backend.set_many({self.make_key(key): value for key, value in data.items()}, self._timeout(timeout))
+        except Exception:
+            self._error("set_many")
+            return
+        self._count("sets", len(data))
+
+    def get_or_set(self, key: str, default: Callable[[], Any], timeout: int | None = DEFAULT_TIMEOUT) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = default()
+            self.set(key, value, timeout)
+        return value
+
+    def delete(self, key: str) -> None:
+        try:
+            self.backend.delete(self.make_key(key))
+        except Exception:
+            self._error("delete")
+
+    def invalidate(self) -> int:
+        """
+        Descarta todas as chaves do namespace (em todos os processos, respeitando o `version_ttl`).
+        Retorna a nova versão.
+        """
+        version_key = self._version_key()
+        self.backend.add(version_key, 1, timeout=None)
+        try:
+            version = self.backend.incr(version_key)
+        except ValueError:
+            # a chave expirou (ou foi despejada) entre o add e o incr
+            version = 2
+            self.backend.set(version_key, version, timeout=None)
+
+        with self._lock:
+            self._version = version
+            self._version_checked_at = time.monotonic()
+        return version
+
+    def make_key(self, key: str) -> str:
+        return f"{self.namespace}:{self._get_version()}:{key}"
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["version"] = self._version
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _get_version(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and now - self._version_checked_at < self.version_ttl:
+                return self._version
+
+        version = self.backend.get(self._version_key()) or 1
+        with self._lock:
+            self._version = version
+            self._version_checked_at = now
+        return version
+
+    def _version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    def _timeout(self, timeout: int | None) -> int | None:
+        return self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        if amount:
+            with self._lock:
+                self._stats[name] += amount
+
+    def _error(self, operation: str) -> None:
+        logger.warning("Cache %s failed for namespace %s", operation, self.namespace, exc_info=True)
+        self._count("errors")
+
+
+def get_namespace(namespace: str) -> NamespacedCache | None:
+    return _namespaces.get(namespace)
+
+
+def get_cache_stats() -> dict:
+    with _namespaces_lock:
+        namespaces = list(_namespaces.values())
+
+    return {
+        "backend": caches["default"].__class__.__name__,
+        "namespaces": {namespace.namespace: namespace.get_stats() for namespace in namespaces},
+    }
@@ -0,0 +1,76 @@
+import hashlib
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+
+from src.utils.http import get_session
+
+
+class DownloadError(Exception):
+    pass
+
+
+class DownloadedFile(File):
+    """
+    Arquivo baixado em um SpooledTemporaryFile (memória até `MEDIA_SPOOL_MAX_MEMORY`, disco acima
+    disso), com o sha256, o tamanho e o content-type calculados durante o download.
+    """
+
+    def __init__(self, file, name: str, sha256: str, size: int, content_type: str):
+        super().__init__(file, name=name)
+        self.sha256 = sha256
+        self.size = size
+        self.content_type = content_type
+
+
+def download_file(
+    url: str,
+    name: str,
+    max_size: int | None = None,
+    allowed_types: list[str] | None = None,
+    chunk_size: int = 64 * 1024,
+) -> DownloadedFile:
+    """
+    Baixa a URL em streaming, sem carregar o arquivo inteiro em memória. Aborta assim que o
+    content-type não for permitido ou o tamanho passar de `max_size`.
+
+    Use como context manager para fechar (e apagar) o arquivo temporário:
+
+        with download_file(url, "media.mp4") as media:
+            post.media.save(media.name, media)
+    """
+    max_size = max_size or settings.MEDIA_MAX_DOWNLOAD_SIZE
+    allowed_types = allowed_types or settings.MEDIA_ALLOWED_CONTENT_TYPES
+
+    timeout = (settings.HTTP_CONNECT_TIMEOUT, settings.MEDIA_DOWNLOAD_TIMEOUT)
+    with get_session().get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type not in allowed_types:
+            raise DownloadError(f"Content type not allowed: {content_type or 'unknown'}")
+
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit() and int(content_length) > max_size:
+            raise DownloadError(f"File size exceeds limit of {max_size} bytes")
+
+        tmp = tempfile.SpooledTemporaryFile(max_size=settings.MEDIA_SPOOL_MAX_MEMORY)
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                size += len(chunk)
+                # o Content-Length pode não vir (ou mentir), então o limite é checado durante o stream
+                if size > max_size:
+                    raise DownloadError(f"File size exceeds limit of {max_size} bytes")
+
+                digest.update(chunk)
+                tmp.write(chunk)
+        except BaseException:
+            tmp.close()
+            raise
+
+    tmp.seek(0)
+    return DownloadedFile(tmp, name=name, sha256=digest.hexdigest(), size=size, content_type=content_type)
@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpSession(requests.Session):
+    """
+    Session compartilhada para chamadas externas: mantém um pool de conexões keep-alive por host,
+    aplica timeouts padrão e guarda estatísticas de uso por host.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+        retries = Retry(
+            total=settings.HTTP_MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            # POST não é idempotente, então só os métodos padrão do urllib3 (GET, HEAD, ...) são repetidos
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=settings.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+            max_retries=retries,
+        )
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", (settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT))
+        host = urlsplit(url).netloc
+
+        with self._lock:
+            stats = self._stats.setdefault(
+                host,
+                {"requests": 0, "errors": 0, "in_flight": 0, "total_time": 0.0, "max_time": 0.0},
+            )
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                stats["errors"] += 1
+            raise
+        finally:
+            # com stream=True o tempo medido é até os headers, não o download do corpo
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats["in_flight"] -= 1
+                stats["total_time"] += elapsed
+                stats["max_time"] = max(stats["max_time"], elapsed)
+
+        if response.status_code >= 500:
+            with self._lock:
+                stats["errors"] += 1
+
+        return response
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            hosts = {host: dict(stats) for host, stats in self._stats.items()}
+
+        for host, stats in hosts.items():
+            stats["avg_time"] = stats["total_time"] / stats["requests"] if stats["requests"] else 0.0
+
+        # conexões abertas e ociosas de cada pool do urllib3
+        for adapter in {id(adapter): adapter for adapter in self.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+
+                host = key.key_host if key.key_port in (None, 80, 443) else f"{key.key_host}:{key.key_port}"
+                stats = hosts.setdefault(host, {})
+                stats["connections_opened"] = stats.get("connections_opened", 0) + pool.num_connections
+                # a fila do urllib3 começa preenchida com None, só conta as conexões reais
+                idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+                stats["idle_connections"] = stats.get("idle_connections", 0) + idle
+                stats["pool_maxsize"] = pool.pool.maxsize
+
+        return hosts
+
+
+_session: HttpSession | None = None
+_session_pid: int | None = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> HttpSession:
+    """
+    Retorna a session do processo atual. Depois de um fork (ex.: workers do gunicorn) uma nova
+    session é criada, já que os sockets do processo pai não podem ser compartilhados.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = HttpSession()
+                _session_pid = pid
+
+    return _session
+
+
+def get_http_stats() -> dict:
+    if _session is None or _session_pid != os.getpid():
+        return {}
+    return _session.get_stats()
@@ -0,0 +1,101 @@
+import io
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+IMAGE_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "WEBP": ("webp", "image/webp"),
+}
+
+HASH_BANDS = 4
+BAND_BITS = 16
+
+
+def dhash(file, size: int = 8) -> int:
+    """
+    Difference hash (dHash) de 64 bits: compara o brilho de pixels vizinhos de uma versão 9x8 em
+    tons de cinza. Reencodes, redimensionamentos e pequenas marcas d'água mudam poucos bits.
+    O valor é devolvido com sinal para caber em um bigint do Postgres.
+    """
+    with Image.open(file) as image:
+        # GIFs e imagens animadas usam só o primeiro frame
+        image.seek(0)
+        pixels = list(image.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS).getdata())
+
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | int(left > right)
+
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def hash_bands(value: int) -> list[int]:
+    """
+    Divide o hash em 4 faixas de 16 bits (com a posição da faixa nos bits altos). Dois hashes com
+    distância de Hamming <= 3 têm pelo menos uma faixa igual, o que permite buscar candidatos
+    por sobreposição em um índice GIN.
+    """
+    unsigned = value & ((1 << 64) - 1)
+    mask = (1 << BAND_BITS) - 1
+    return [(band << BAND_BITS) | ((unsigned >> (band * BAND_BITS)) & mask) for band in range(HASH_BANDS)]
+
+
+def make_vision_image(file, name: str = "vision") -> ContentFile:
+    """
+    Versão reduzida da imagem para as IAs de visão: primeiro frame (GIFs), orientação EXIF aplicada,
+    lado maior limitado a `VISION_IMAGE_MAX_SIDE` e recomprimida em `VISION_IMAGE_FORMAT`.
+    """
+    image_format = settings.VISION_IMAGE_FORMAT
+    extension, _ = IMAGE_FORMATS[image_format]
+
+    with Image.open(file) as image:
+        image.seek(0)
+        image = ImageOps.exif_transpose(image).convert("RGB")
+
+    max_side = settings.VISION_IMAGE_MAX_SIDE
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, quality=settings.VISION_IMAGE_QUALITY, optimize=True)
+    return ContentFile(buffer.getvalue(), name=f"{name}.{extension}")
+
+
+def make_renditions(file, widths: list[int]) -> dict[int, ContentFile]:
+    """
+    Renditions em WebP por faixa de largura (ex.: 320/640/1080) a partir do primeiro frame.
+    Não aumenta a imagem: larguras maiores que a original são ignoradas e imagens menores que a
+    menor faixa geram só essa faixa, no tamanho original.
+    """
+    with Image.open(file) as image:
+        image.seek(0)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+    widths = sorted(widths)
+    selected = [width for width in widths if width <= image.width] or widths[:1]
+
+    renditions = {}
+    for width in selected:
+        rendition = image
+        if width < image.width:
+            height = max(1, round(image.height * width / image.width))
+            rendition = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        rendition.save(buffer, format="WEBP", quality=settings.RENDITION_QUALITY, method=4)
+        renditions[width] = ContentFile(buffer.getvalue(), name=f"{width}.webp")
+
+    return renditions
+
+
+def image_mime_type(name: str) -> str:
+    extension = name.rsplit(".", 1)[-1].lower()
+    for format_extension, mime_type in IMAGE_FORMATS.values():
+        if extension == format_extension:
+            return mime_type
+    return "image/jpeg"
@@ -1,46 +1,149 @@
 import io
 import os
+import subprocess
 import tempfile
+import threading
 
+import imageio_ffmpeg
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import UploadedFile
-from moviepy import VideoFileClip
 from PIL import Image
 
+# limita quantos processos do ffmpeg rodam ao mesmo tempo neste processo
+_ffmpeg_slots = threading.BoundedSemaphore(settings.VIDEO_THUMBNAIL_MAX_PROCESSES)
+
+
+class VideoThumbnailError(Exception):
+    pass
+
+
+def extract_video_frame(file, timestamp: float = 0.5) -> Image.Image:
+    """
+    Extrai um frame do vídeo com o ffmpeg, com o `-ss` antes do `-i` para ir direto ao keyframe
+    mais próximo sem decodificar o vídeo inteiro. O frame sai por pipe, sem arquivo intermediário.
+
+    Arquivos com caminho local (FileSystemStorage, uploads grandes) ou URL (GCS) são lidos direto
+    pelo ffmpeg; só os demais são copiados para um arquivo temporário.
+    """
+    source = _get_source(file)
+    tmp_path = None
+
+    if source is None:
+        _, ext = os.path.splitext(file.name or "")
+        with tempfile.NamedTemporaryFile(suffix=ext or ".mp4", delete=False) as tmp:
+            for chunk in file.chunks():
+                tmp.write(chunk)
+            tmp_path = source = tmp.name
+
+    try:
+        frame = _run_ffmpeg(source, timestamp)
+        # vídeos mais curtos que o timestamp não têm frame no ponto pedido
+        if not frame and timestamp > 0:
+            frame = _run_ffmpeg(source, 0)
+    finally:
+        if tmp_path:
+            os.remove(tmp_path)
+
+    if not frame:
+        raise VideoThumbnailError("No frame could be extracted from the video")
+
+    image = Image.open(io.BytesIO(frame))
+    image.load()
+    return image.convert("RGB")
+
+
+def generate_video_thumbnails(
+    file,
+    sizes: list[int | None],
+    timestamp: float = 0.5,
+    image_format: str = "JPEG",
+) -> dict[int | None, ContentFile]:
+    """
+    Gera thumbnails em vários tamanhos (lado maior, `None` para o tamanho original) a partir de uma
+    única extração de frame.
+    """
+    frame = extract_video_frame(file, timestamp)
+    extension = image_format.lower()
+
+    thumbnails = {}
+    for size in sizes:
+        image = frame.copy()
+        if size:
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format=image_format, quality=85)
+        name = f"thumbnail_{size}.{extension}" if size else f"thumbnail.{extension}"
+        thumbnails[size] = ContentFile(buffer.getvalue(), name=name)
+
+    return thumbnails
+
 
 def generate_video_thumbnail_from_upload(
     uploaded_file: UploadedFile,
     timestamp: float = 0.5,
 ) -> ContentFile:
     """
-    Gera uma thumbnail (JPEG) a partir de um UploadedFile de vídeo.
-    Cria um arquivo temporário no disco (necessário pro ffmpeg/moviepy),
-    pega um frame e devolve um ContentFile pronto pra ser salvo em um ImageField.
+    Gera uma thumbnail (JPEG) a partir de um arquivo de vídeo (UploadedFile ou FieldFile)
+    e devolve um ContentFile pronto pra ser salvo em um FileField.
     """
+    thumbnail = generate_video_thumbnails(uploaded_file, [None], timestamp)[None]
+    thumbnail.name = "thumbnail.jpeg"
+    return thumbnail
+
 
-    _, ext = os.path.splitext(uploaded_file.name)
-    if not ext:
-        ext = ".mp4"
+def _get_source(file) -> str | None:
+    if hasattr(file, "temporary_file_path"):
+        return file.temporary_file_path()
 
-    with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-        for chunk in uploaded_file.chunks():
-            tmp.write(chunk)
-        tmp_path = tmp.name
+    storage = getattr(file, "storage", None)
+    if storage is None or not file.name:
+        return None
 
     try:
-        clip = VideoFileClip(tmp_path)
+        return storage.path(file.name)
+    except NotImplementedError:
+        pass
 
-        ts = min(timestamp, max(0, clip.duration - 0.1))
+    # storages remotos (GCS): o ffmpeg lê a URL usando range requests, sem baixar o arquivo todo
+    url = storage.url(file.name)
+    if url.startswith(("http://", "https://")):
+        return url
+    return None
 
-        frame = clip.get_frame(ts)
-        clip.close()
-    finally:
-        os.remove(tmp_path)
 
-    image = Image.fromarray(frame)
+def _run_ffmpeg(source: str, timestamp: float) -> bytes:
+    command = [
+        imageio_ffmpeg.get_ffmpeg_exe(),
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-ss",
+        str(timestamp),
+        "-i",
+        source,
+        "-frames:v",
+        "1",
+        "-f",
+        "image2pipe",
+        "-vcodec",
+        "png",
+        "pipe:1",
+    ]
+
+    timeout = settings.VIDEO_THUMBNAIL_TIMEOUT
+    if not _ffmpeg_slots.acquire(timeout=timeout):
+        raise VideoThumbnailError("Timed out waiting for a free ffmpeg slot")
+
+    try:
+        result = subprocess.run(command, capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise VideoThumbnailError(f"ffmpeg timed out after {timeout}s")
+    finally:
+        _ffmpeg_slots.release()
 
-    buffer = io.BytesIO()
-    image.save(buffer, format="JPEG")
-    buffer.seek(0)
+    if result.returncode != 0:
+        raise VideoThumbnailError(result.stderr.decode(errors="ignore").strip() or "ffmpeg failed")
 
-    return ContentFile(buffer.getvalue(), name="thumbnail.jpeg")
+    return result.stdout
@@ -0,0 +1,148 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings as django_settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils.translation import gettext_lazy as _
+from ninja import Field, Schema
+from ninja.conf import settings
+from ninja.errors import HttpError
+from ninja.pagination import PaginationBase
+
+from src.utils.vector import set_vector_search_params
+
+
+class KeysetPagination(PaginationBase):
+    """
+    Paginação por cursor (keyset) sobre a ordenação do queryset + chave primária.
+
+    Não usa OFFSET nem COUNT(*): cada página filtra a partir do último item da página
+    anterior, então o custo é o mesmo independente da profundidade. Funciona tanto com
+    campos do model (ex.: `-created_at`) quanto com anotações (ex.: `distance`).
+
+    Com `vector_profile` (feeds ordenados por distância) aplica o perfil de busca vetorial com a
+    profundidade do cursor e não serve nada além do `max_depth` do perfil: o iterative scan em
+    strict_order reescaneia as linhas das páginas anteriores, então o custo cresce com a profundidade.
+    """
+
+    class Input(Schema):
+        cursor: str | None = Field(None, description=_("Cursor"))
+        limit: int = Field(settings.PAGINATION_PER_PAGE, ge=1, description=_("Limit"))
+
+    class Output(Schema):
+        items: list[Any]
+        next: str | None = Field(None, description=_("Next Cursor"))
+
+    def __init__(self, max_limit: int = 100, vector_profile: str | None = None, **kwargs):
+        self.max_limit = max_limit
+        self.vector_profile = vector_profile
+        self.max_depth = None
+        if vector_profile:
+            self.max_depth = django_settings.VECTOR_SEARCH_PROFILES[vector_profile].get("max_depth")
+        super().__init__(**kwargs)
+
+    def paginate_queryset(self, queryset: QuerySet, pagination: Input, **params):
+        limit = min(pagination.limit, self.max_limit)
+        field, descending = self._get_ordering(queryset)
+        pk_name = queryset.model._meta.pk.name
+        direction = "-" if descending else ""
+
+        queryset = queryset.order_by(f"{direction}{field}", f"{direction}{pk_name}")
+
+        depth = 0
+        if pagination.cursor:
+            value, pk, depth = self._decode_cursor(queryset, field, pagination.cursor)
+            queryset = queryset.filter(self._after(field, pk_name, value, pk, descending))
+
+        if self.max_depth is not None:
+            limit = min(limit, self.max_depth - depth)
+            if limit <= 0:
+                return {self.items_attribute: [], "next": None}
+
+        # busca um item a mais só para saber se existe próxima página
+        if self.vector_profile:
+            with transaction.atomic():
+                set_vector_search_params(self.vector_profile, depth=depth)
+                items = list(queryset[: limit + 1])
+        else:
+            items = list(queryset[: limit + 1])
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            if self.max_depth is None or depth + limit < self.max_depth:
+                last = items[-1]
+                next_cursor = self._encode_cursor(getattr(last, field), last.pk, depth + limit)
+
+        self._prime_media_urls(items)
+
+        return {
+            self.items_attribute: items,
+            "next": next_cursor,
+        }
+
+    def _prime_media_urls(self, items: list[Any]) -> None:
+        # resolve (assina) as URLs de mídia da página inteira de uma vez, antes da serialização
+        url_many = getattr(default_storage, "url_many", None)
+        if url_many is None:
+            return
+
+        names = [name for item in items if hasattr(item, "media_file_names") for name in item.media_file_names()]
+        if names:
+            url_many(names)
+
+    def _get_ordering(self, queryset: QuerySet) -> tuple[str, bool]:
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        if not ordering or not isinstance(ordering[0], str):
+            raise ValueError("KeysetPagination requires a queryset ordered by a field name")
+
+        field = ordering[0]
+        return field.lstrip("-"), field.startswith("-")
+
+    def _after(self, field: str, pk_name: str, value: Any, pk: Any, descending: bool) -> Q:
+        # no Postgres os NULLs ficam no fim em ordem ascendente e no começo em ordem descendente
+        lookup = "lt" if descending else "gt"
+
+        if value is None:
+            condition = Q(**{f"{field}__isnull": True, f"{pk_name}__{lookup}": pk})
+            if descending:
+                condition |= Q(**{f"{field}__isnull": False})
+            return condition
+
+        condition = Q(**{f"{field}__{lookup}": value}) | Q(**{field: value, f"{pk_name}__{lookup}": pk})
+        if not descending:
+            condition |= Q(**{f"{field}__isnull": True})
+        return condition
+
+    def _encode_cursor(self, value: Any, pk: Any, depth: int) -> str:
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, UUID):
+            value = str(value)
+
+        payload = json.dumps([value, str(pk), depth], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _decode_cursor(self, queryset: QuerySet, field: str, cursor: str) -> tuple[Any, Any, int]:
+        try:
+            # cursores antigos não têm a profundidade
+            value, pk, *rest = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            depth = max(int(rest[0]), 0) if rest else 0
+            meta = queryset.model._meta
+            pk = meta.pk.to_python(pk)
+            try:
+                value = meta.get_field(field).to_python(value)
+            except FieldDoesNotExist:
+                # anotações (ex.: distance) já chegam no tipo certo pelo JSON
+                pass
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, ValidationError):
+            raise HttpError(400, "Invalid cursor")
+
+        return value, pk, depth
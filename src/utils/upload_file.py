@@ -1,5 +1,14 @@
+import hashlib
 import os
 
+# content types aceitos no upload direto e a extensão usada no storage
+UPLOAD_CONTENT_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "video/mp4": "mp4",
+}
+
 
 def path_and_rename_media(object, filename):
     upload_to = type(object).__name__.lower()
@@ -13,3 +22,37 @@ def path_and_rename_thumbnail(object, filename):
     ext = filename.split(".")[-1]
     filename = f"{str(object.uuid)}/thumbnail.{ext}"
     return os.path.join(upload_to, filename)
+
+
+def path_and_rename_vision_image(object, filename):
+    upload_to = type(object).__name__.lower()
+    ext = filename.split(".")[-1]
+    filename = f"{str(object.uuid)}/vision.{ext}"
+    return os.path.join(upload_to, filename)
+
+
+def path_and_rename_rendition(object, filename):
+    upload_to = type(object).__name__.lower()
+    return os.path.join(upload_to, str(object.uuid), "renditions", filename)
+
+
+def file_sha256(file) -> str:
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detect_content_type(header: bytes) -> str | None:
+    """
+    Content type real do arquivo pelos primeiros bytes (assinatura), sem confiar no que o cliente declarou.
+    """
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if header.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if header[4:8] == b"ftyp":
+        return "video/mp4"
+    return None
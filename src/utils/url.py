@@ -0,0 +1,46 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# parâmetros de rastreamento/compartilhamento que não mudam o conteúdo apontado pela URL
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "igsh",
+    "igshid",
+    "mibextid",
+    "ref",
+    "ref_src",
+    "ref_url",
+    "s",
+    "si",
+    "feature",
+    "share_id",
+    "_t",
+    "_r",
+}
+
+
+def normalize_social_url(url: str) -> str:
+    """
+    Normaliza a URL de um post de rede social para ser usada como chave: remove parâmetros de
+    rastreamento (utm_*, igshid, fbclid, ...), fragmento, `www.`/`m.` e a barra final.
+    """
+    parts = urlsplit(url.strip())
+
+    scheme = (parts.scheme or "https").lower()
+    if scheme == "http":
+        scheme = "https"
+
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "m.", "mobile."):
+        if host.startswith(prefix):
+            host = host[len(prefix) :]
+            break
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
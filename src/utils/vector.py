@@ -0,0 +1,60 @@
+from functools import cache
+
+from django.conf import settings
+from django.db import connection
+
+# chave do perfil -> (parâmetro do Postgres, versão mínima do pgvector)
+VECTOR_SEARCH_PARAMS = {
+    "ef_search": ("hnsw.ef_search", (0, 5, 0)),
+    "probes": ("ivfflat.probes", (0, 1, 0)),
+    "iterative_scan": ("hnsw.iterative_scan", (0, 8, 0)),
+    "max_scan_tuples": ("hnsw.max_scan_tuples", (0, 8, 0)),
+    "ivfflat_iterative_scan": ("ivfflat.iterative_scan", (0, 8, 0)),
+    "max_probes": ("ivfflat.max_probes", (0, 8, 0)),
+}
+
+
+@cache
+def get_pgvector_version() -> tuple[int, ...]:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        row = cursor.fetchone()
+
+    if not row:
+        return (0, 0, 0)
+    return tuple(int(part) for part in row[0].split(".") if part.isdigit())
+
+
+def set_vector_search_params(profile: str, depth: int = 0) -> None:
+    """
+    Aplica no Postgres os parâmetros de busca vetorial do perfil (ver VECTOR_SEARCH_PROFILES).
+    Os valores valem só até o fim da transação atual (`set_config(..., true)`), então a chamada e a
+    consulta ordenada por distância ficam no mesmo `transaction.atomic()`: com conexões persistentes
+    (CONN_MAX_AGE) o perfil não vaza para as próximas consultas da conexão.
+
+    Com o iterative scan (pgvector >= 0.8) o índice continua buscando candidatos até completar
+    o LIMIT quando os filtros (denúncias, reações do usuário, etc.) descartam linhas, limitado
+    por `max_scan_tuples`/`max_probes`. Em versões antigas esses parâmetros são ignorados.
+
+    `depth` é quantas linhas as páginas anteriores já devolveram: o strict_order precisa passar de
+    novo por elas, então o `max_scan_tuples` cresce `scan_tuples_per_row` por linha.
+    """
+    if not connection.in_atomic_block:
+        raise RuntimeError("set_vector_search_params must run inside transaction.atomic()")
+
+    params = dict(settings.VECTOR_SEARCH_PROFILES.get(profile, {}))
+    if depth and "max_scan_tuples" in params:
+        params["max_scan_tuples"] += depth * params.get("scan_tuples_per_row", 0)
+    version = get_pgvector_version()
+
+    configs = [
+        (setting, str(params[key]))
+        for key, (setting, min_version) in VECTOR_SEARCH_PARAMS.items()
+        if key in params and version >= min_version
+    ]
+    if not configs:
+        return
+
+    sql = "SELECT " + ", ".join("set_config(%s, %s, true)" for _ in configs)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [value for config in configs for value in config])